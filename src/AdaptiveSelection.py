@@ -0,0 +1,87 @@
+def improvement_gain(new, old, time_limit):
+    """
+    Gewinn eines Zuges als eine Zahl: Score-Zuwachs plus eingesparte Distanz relativ zum TimeLimit.
+    Der Distanzanteil ist immer kleiner als ein Score-Punkt und entscheidet damit nur bei gleichem Score (wie die Vergleiche in der VNS).
+    Verschlechterungen zählen als 0.
+    """
+    gain = (new.score - old.score) + (old.total_distance - new.total_distance) / time_limit
+    return gain if gain > 0 else 0.0
+
+
+class AdaptiveOperatorSelector:
+    """
+    ALNS-artige Auswahl von Operatoren per Roulette.
+    Jeder Operator hat ein Gewicht = geglätteter Gewinn pro Kosteneinheit: w <- decay * w + (1 - decay) * (Gewinn / Kosten).
+    Operatoren, die selten helfen und teuer sind, werden dadurch seltener gezogen.
+
+    Kosten:
+        'evaluations': Anzahl bewerteter Nachbarn (deterministisches Maß für die Rechenzeit / Läufe bleiben mit festem Seed reproduzierbar)
+        'cpu': echte CPU-Sekunden über time.process_time (genauer, aber nicht reproduzierbar)
+    min_share: Anteil der Wahrscheinlichkeit, der immer gleich verteilt wird, damit kein Operator ganz ausstirbt.
+    Noch nie bewertete Operatoren bekommen das höchste bekannte Gewicht (optimistischer Start).
+    Zufall kommt nur aus `rnd` (derselbe Generator wie in der VNS).
+    """
+    def __init__(self, names, rnd, decay=0.8, min_share=0.1, cost_mode='evaluations'):
+        if cost_mode not in ('evaluations', 'cpu'):
+            raise ValueError(f"Unbekannter cost_mode '{cost_mode}' (erlaubt: 'evaluations', 'cpu')")
+        self.names = list(names)
+        self.random = rnd
+        self.decay = decay
+        self.min_share = min_share
+        self.cost_mode = cost_mode
+        self.weights = {name: None for name in self.names}
+        self.uses = {name: 0 for name in self.names}
+
+    def cost(self, evaluations, seconds):
+        """Kosten eines Einsatzes im gewählten Maß: bewertete Nachbarn oder CPU-Sekunden (time.process_time)."""
+        return seconds if self.cost_mode == 'cpu' else evaluations
+
+    def _effective_weights(self, names):
+        known = [w for w in self.weights.values() if w is not None]
+        default = max(known) if known else 1.0
+        return [default if self.weights[name] is None else self.weights[name] for name in names]
+
+    def probabilities(self, names=None):
+        """Roulette-Wahrscheinlichkeiten für die gegebenen (oder alle) Operatoren."""
+        names = self.names if names is None else names
+        weights = self._effective_weights(names)
+        total = sum(weights)
+        if total <= 0:
+            return [1.0 / len(names)] * len(names)
+        return [(1 - self.min_share) * w / total + self.min_share / len(names) for w in weights]
+
+    def sample(self, k):
+        """Zieht k verschiedene Operatoren per Roulette (ohne Zurücklegen), in Ziehungsreihenfolge."""
+        remaining = list(self.names)
+        chosen = []
+        for _ in range(min(k, len(remaining))):
+            probabilities = self.probabilities(remaining)
+            r = self.random.random() * sum(probabilities)
+            index = len(remaining) - 1
+            for i, p in enumerate(probabilities):
+                r -= p
+                if r < 0:
+                    index = i
+                    break
+            chosen.append(remaining.pop(index))
+        return chosen
+
+    def order(self):
+        """Reihenfolge aller Operatoren per Roulette (z. B. für die Nachbarschaften der VND)."""
+        return self.sample(len(self.names))
+
+    def update(self, name, gain, cost):
+        """Verbucht einen Einsatz: Gewinn (siehe improvement_gain) und Kosten (siehe cost)."""
+        # Mindestkosten: eine Bewertung bzw. eine Millisekunde (sonst wären Operatoren ohne messbare Kosten unendlich gut)
+        rate = gain / max(cost, 1 if self.cost_mode == 'evaluations' else 1e-3)
+        old = self.weights[name]
+        self.weights[name] = rate if old is None else self.decay * old + (1 - self.decay) * rate
+        self.uses[name] += 1
+
+    def get_state(self):
+        """Gewichte und Zähler für Checkpoints / run_info."""
+        return {'weights': dict(self.weights), 'uses': dict(self.uses)}
+
+    def set_state(self, state):
+        self.weights.update(state['weights'])
+        self.uses.update(state['uses'])
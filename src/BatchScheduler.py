@@ -0,0 +1,207 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from Bounds import compute_upper_bound, optimality_gap
+from Deadline import Deadline
+from InputData import load_instance
+from StartSolutionSelector import select_best_start_solution
+from VNS import DEFAULT_PARAMS, iterate_vns_parametrized
+
+# Gründe, aus denen eine Instanz fertig ist und keine Zeit mehr braucht (run_info['stop_reason'] der VNS)
+FINISHED_REASONS = ('stagnation', 'upper_bound', 'max_iterations', 'converged')
+
+
+class _InstanceTask:
+    """Zustand einer Instanz im Batch: Suchzustand der VNS zwischen den Zeitscheiben, verbrauchte CPU-Zeit, Verbesserungsrate."""
+    def __init__(self, path, data, rnd, params, start_solution):
+        self.path = path
+        self.data = data
+        self.rnd = rnd
+        self.params = params
+        self.start_solution = start_solution
+        self.best = start_solution
+        self.state = None
+        self.run_info = {}
+        self.cpu_seconds = 0.0
+        self.slices = 0
+        self.rate = None  # geglättete relative Verbesserung pro CPU-Sekunde / None = noch nicht gemessen
+        self.slice_floor = 0.0  # kürzeste sinnvolle Zeitscheibe (wächst bei großen Instanzen mit der Dauer einer Iteration)
+        self.finished = False
+
+
+class BatchScheduler:
+    """
+    Verteilt ein gemeinsames CPU-Budget dynamisch auf mehrere Instanzen, statt jeder dasselbe feste max_time zu geben.
+
+    Gerechnet wird in Runden: Jede Runde (round_seconds) wird auf die noch aktiven Instanzen aufgeteilt, proportional
+    zu ihrer gemessenen Verbesserungsrate (relativer Score-Gewinn pro CPU-Sekunde, exponentiell geglättet).
+    Jede aktive Instanz bekommt mindestens `min_share` des Anteils der schnellsten, damit sich eine Rate auch wieder erholen kann.
+    Die VNS einer Instanz läuft dabei nicht neu an: nach jeder Zeitscheibe wird ihr Suchzustand im Speicher gehalten
+    (Parameter 'capture_state') und in der nächsten über resume_state fortgesetzt.
+    Endet die VNS einer Instanz von selbst (Stagnationslimit, obere Schranke erreicht, Konvergenz über 'stop_gain_rate'), ist sie fertig und ihre Zeit geht
+    ab der nächsten Runde an die übrigen Instanzen.
+
+    Die Zeitscheiben einer Instanz sind mindestens so lang, dass `min_iterations` VNS-Iterationen hineinpassen: Eine vom Ende
+    der Scheibe unterbrochene VND verliert ihre Arbeit, bei großen Instanzen würden zu kurze Scheiben nie etwas finden.
+    Erst eine Scheibe mit so vielen vollständigen Iterationen zählt für die Rate, bis dahin gilt die Instanz als vielversprechend.
+
+    Das Budget ist CPU-Zeit dieses Prozesses (time.process_time), inkl. Einlesen, Schranke und Startlösung. Die Zeitscheiben
+    laufen mit einer Deadline auf derselben Uhr, bei fremder Last auf dem Rechner stimmen Anteile und Raten also weiterhin.
+    Ein Rest, der kürzer als `min_slice` bzw. die Mindestscheibe einer Instanz ist, wird nicht mehr verteilt
+    (jede Scheibe kostet ein Fortsetzen der VNS, Splitter am Ende des Budgets bringen nichts).
+    """
+    def __init__(self, instances, total_budget, seed=1, params=None, rounds=20, min_slice=0.5, min_share=0.1,
+                 smoothing=0.5, min_iterations=3, verbose=True):
+        self.instances = list(instances)
+        self.total_budget = total_budget
+        self.seed = seed
+        self.params = dict(DEFAULT_PARAMS)
+        self.params.update(params or {})
+        self.round_seconds = total_budget / max(1, rounds)
+        self.min_slice = min_slice
+        self.min_share = min_share
+        self.smoothing = smoothing
+        self.min_iterations = min_iterations
+        self.verbose = verbose
+        self.tasks = []
+        self._cpu_start = None
+
+    def used(self):
+        return time.process_time() - self._cpu_start
+
+    def remaining(self):
+        return max(0.0, self.total_budget - self.used())
+
+    def _prepare(self, path):
+        before = time.process_time()
+        data = load_instance(path)
+        rnd = random.Random(self.seed)
+        params = dict(self.params, capture_state=True)
+        if params.get('upper_bound') is None and params.get('use_upper_bound', True):
+            # Schranke einmal pro Instanz statt in jeder Zeitscheibe
+            params['upper_bound'] = compute_upper_bound(data)
+        start_solution, _ = select_best_start_solution(data, rnd=rnd)
+        task = _InstanceTask(path, data, rnd, params, start_solution)
+        task.cpu_seconds = time.process_time() - before
+        task.slice_floor = self.min_slice
+        return task
+
+    def _shares(self, active):
+        """Anteil jeder aktiven Instanz an der nächsten Runde (ungemessene Instanzen zählen wie die schnellste)."""
+        known = [task.rate for task in active if task.rate is not None]
+        top = max(known) if known else 0.0
+        if top <= 0.0:
+            return {task: 1.0 / len(active) for task in active}
+        weights = {task: max(top if task.rate is None else task.rate, self.min_share * top) for task in active}
+        total = sum(weights.values())
+        return {task: weight / total for task, weight in weights.items()}
+
+    def run_slice(self, task, seconds):
+        """Setzt die VNS einer Instanz für `seconds` Sekunden fort und aktualisiert Rate und Status."""
+        before_score = task.best.score
+        before_iterations = task.run_info.get('iterations', 0)
+        before = time.process_time()
+        deadline = Deadline(seconds, check_every=task.params.get('deadline_check_every', 64), clock=time.process_time)
+        run_info = {}
+        for progress in iterate_vns_parametrized(task.data, task.start_solution, task.rnd, task.params, time.time(), verbose=False,
+                                                 deadline=deadline, run_info=run_info, resume_state=task.state):
+            task.best = progress.solution
+        spent = time.process_time() - before
+        task.cpu_seconds += spent
+        task.slices += 1
+        task.state = run_info['state']
+        task.run_info = run_info
+        task.finished = run_info['stop_reason'] in FINISHED_REASONS
+
+        # Die letzte Iteration einer vom Zeitlimit beendeten Scheibe ist meist unvollständig
+        completed = run_info['iterations'] - before_iterations - (run_info['stop_reason'] == 'time')
+        if completed < self.min_iterations and not task.finished:
+            # Zu kurz für eine Aussage: Scheibe verlängern, Rate bleibt unverändert
+            task.slice_floor *= 2
+            return spent
+        task.slice_floor = max(self.min_slice, self.min_iterations * spent / max(1, completed))
+        gain = (task.best.score - before_score) / max(1, before_score) / max(spent, 1e-3)
+        task.rate = gain if task.rate is None else self.smoothing * gain + (1 - self.smoothing) * task.rate
+        return spent
+
+    def run(self):
+        """Rechnet bis das Budget verbraucht oder alle Instanzen fertig sind. Rückgabe: Ergebniszeile pro Instanz."""
+        self._cpu_start = time.process_time()
+        self.tasks = [self._prepare(path) for path in self.instances]
+        number = 0
+        while self.remaining() >= self.min_slice:
+            active = [task for task in self.tasks if not task.finished]
+            if not active: break
+            number += 1
+            round_seconds = min(self.round_seconds, self.remaining())
+            shares = self._shares(active)
+            scheduled = False
+            for task in sorted(active, key=lambda task: -shares[task]):
+                remaining = self.remaining()
+                # Rest reicht nicht mehr für eine sinnvolle Scheibe dieser Instanz
+                if remaining < max(self.min_slice, task.slice_floor): continue
+                seconds = min(max(task.slice_floor, round_seconds * shares[task]), remaining)
+                scheduled = True
+                self.run_slice(task, seconds)
+                if self.verbose:
+                    print(f"Runde {number}: {task.data.name:<12} {seconds:6.2f} s -> Score {task.best.score:<6} "
+                          f"Rate {'-' if task.rate is None else f'{task.rate:.5f}'}/s{' (fertig: ' + task.run_info['stop_reason'] + ')' if task.finished else ''}")
+            if not scheduled: break
+        return self.results()
+
+    def results(self):
+        rows = []
+        for task in self.tasks:
+            upper_bound = task.params.get('upper_bound')
+            rows.append({
+                'instance': task.data.name,
+                'instance_path': task.path,
+                'score': task.best.score,
+                'distance': task.best.total_distance,
+                'is_valid': task.best.is_valid,
+                'tour': task.best.tour,
+                'start_score': task.start_solution.score,
+                'cpu_seconds': task.cpu_seconds,
+                'slices': task.slices,
+                'iterations': task.run_info.get('iterations', 0),
+                'stop_reason': task.run_info.get('stop_reason') if task.finished else 'budget',
+                'upper_bound': upper_bound,
+                'gap': optimality_gap(task.best.score, upper_bound),
+            })
+        return rows
+
+
+def schedule_batch(instances, total_budget, seed=1, params=None, verbose=True, **options):
+    """Kurzform: BatchScheduler(...).run() / options: rounds, min_slice, min_share, smoothing, min_iterations."""
+    return BatchScheduler(instances, total_budget, seed, params, verbose=verbose, **options).run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verteilt ein gemeinsames CPU-Budget dynamisch auf mehrere Instanzen.")
+    parser.add_argument('instances', nargs='+', help="Instanzdateien")
+    parser.add_argument('--budget', type=float, required=True, help="Gesamtes CPU-Budget in Sekunden für alle Instanzen")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--rounds', type=int, default=20, help="Anzahl Runden, auf die das Budget aufgeteilt wird")
+    parser.add_argument('--min-slice', type=float, default=0.5, help="Kürzeste Zeitscheibe in Sekunden")
+    parser.add_argument('--output', help="Ergebnis als JSON schreiben")
+    args = parser.parse_args(argv)
+
+    rows = schedule_batch(args.instances, args.budget, args.seed, rounds=args.rounds, min_slice=args.min_slice)
+    print(f"\n{'Instanz':<14}{'Score':>8}{'Start':>8}{'CPU [s]':>10}{'Scheiben':>10}  Ende")
+    for row in rows:
+        print(f"{row['instance']:<14}{row['score']:>8}{row['start_score']:>8}{row['cpu_seconds']:>10.1f}{row['slices']:>10}  {row['stop_reason']}")
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(rows, file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
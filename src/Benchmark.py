@@ -0,0 +1,222 @@
+"""
+Benchmarks für Bewertung, Operatoren, Konstruktionsheuristiken und VNS mit Regressionsvergleich gegen eine Baseline.
+
+Die Baseline (Standard: benchmarks/baseline.json) ist rechnerabhängig und liegt nicht im Repository. Sie muss einmal auf dem
+Vergleichsrechner mit `python Benchmark.py --save-baseline` angelegt werden.
+Exit-Status: 0 = keine Regression (oder Baseline gespeichert), 1 = Regression, 2 = keine Baseline vorhanden, es wurde nichts verglichen.
+In CI ist 2 also kein Erfolg, sondern ein Hinweis, dass die Baseline fehlt.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from InputData import InputData
+from ConstructiveHeuristic import generate_solution
+from Neighborhood import NeighborhoodGenerator
+from OutputData import TourSolution
+from StartSolutionSelector import select_best_start_solution
+from VNS import DEFAULT_PARAMS, run_vns_parametrized
+from InstanceGenerator import generate_scaling_set
+
+INSTANCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Instanzen')
+DEFAULT_INSTANCES = [os.path.join(INSTANCE_DIR, f"Instance_{i}.json") for i in range(1, 6)]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks', 'baseline.json')
+SYNTHETIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks', 'synthetic')
+
+CONSTRUCTION_METHODS = ["greedy", "random", "randomized_greedy", "best_insertion", "clustered_greedy",
+                        "shortest_path", "efficiency", "randomized_best_insertion", "greedy_shuffle"]
+LOCAL_SEARCH_OPERATORS = ["add_best_node", "insert_best_node_at_best_position", "replace_node", "segment_move", "held_karp_reorder"]
+# Held-Karp ist in DEFAULT_PARAMS aus, der Operator wird für den Operator-Benchmark trotzdem mit dieser Grenze gemessen
+HELD_KARP_MAX_NODES = 12
+# Exit-Status von main()
+EXIT_REGRESSION = 1
+EXIT_NO_BASELINE = 2
+BATCHED_OPERATORS = ["add_best_node", "insert_best_node_at_best_position", "replace_node"]
+
+
+def _time_call(function, repeat, min_time=0.05):
+    """
+    Führt `function` `repeat` mal aus, je so oft hintereinander, dass eine Wiederholung mindestens `min_time` Sekunden dauert
+    (wie timeit.autorange / schnelle Operationen werden sonst vom Timer-Rauschen dominiert).
+    Rückgabe: (beste Zeit pro Aufruf, mittlere Zeit pro Aufruf, Ergebnis des letzten Aufrufs).
+    Das Minimum ist das robusteste Maß gegen Störungen durch andere Prozesse und wird für den Baseline-Vergleich genutzt.
+    """
+    start = time.perf_counter()
+    result = function()
+    first = time.perf_counter() - start
+    number = max(1, int(min_time / first)) if first > 0 else 1000
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            result = function()
+        times.append((time.perf_counter() - start) / number)
+    return min(times), sum(times) / len(times), result
+
+
+def _held_karp_call(ng, data, solution):
+    """
+    Aufruf für operator[held_karp_reorder]. Die DP läuft nur für Touren mit höchstens HELD_KARP_MAX_NODES Kunden,
+    gemessen wird deshalb auf den ersten HELD_KARP_MAX_NODES Kunden der Startlösung (sonst auf den meisten Instanzen ein leerer Aufruf).
+    Der Sequencer wird vor jedem Aufruf geleert, sonst misst _time_call ab dem zweiten Aufruf nur den Zugriff auf die gespeicherte Tour.
+    """
+    short = TourSolution([1] + solution.tour[1:-1][:HELD_KARP_MAX_NODES] + [1], data.time_limit)
+    short.evaluate(data)
+    def call():
+        ng.held_karp.clear()
+        return ng.held_karp_reorder(short)
+    return call
+
+
+def _row(benchmark, instance, best, mean, **extra):
+    row = {'benchmark': benchmark, 'instance': instance, 'seconds': best, 'mean_seconds': mean}
+    row.update(extra)
+    return row
+
+
+def benchmark_instance(path, repeat=5, vns_iterations=20, seed=1):
+    """
+    Alle Benchmarks für eine Instanz. Jeder Benchmark startet mit einem eigenen Seed, die Ergebnisse sind damit reproduzierbar.
+    - evaluate: TourSolution.evaluate der Startlösung
+    - construct[<Methode>]: jede Methode von generate_solution
+    - operator[<Name>]: jeder Operator des NeighborhoodGenerator auf der Startlösung (gebündelte Varianten mit [batched],
+      held_karp_reorder auf höchstens HELD_KARP_MAX_NODES Kunden und ohne Cache, siehe _held_karp_call)
+    - vns[<n> iterations]: VNS mit DEFAULT_PARAMS und fester Iterationszahl (ohne Zeit-, Stagnations- und Schrankenabbruch)
+    """
+    data = InputData(path)
+    name = data.name or os.path.splitext(os.path.basename(path))[0]
+    rows = []
+
+    start_solution, _ = select_best_start_solution(data, rnd=random.Random(seed))
+    best, mean, _ = _time_call(lambda: start_solution.evaluate(data), repeat)
+    rows.append(_row('evaluate', name, best, mean, tour_length=len(start_solution.tour)))
+
+    for method in CONSTRUCTION_METHODS:
+        best, mean, solution = _time_call(lambda: generate_solution(data, method=method, rnd=random.Random(seed)), repeat)
+        rows.append(_row(f"construct[{method}]", name, best, mean, score=solution.score))
+
+    for batched in (False, True):
+        ng = NeighborhoodGenerator(data, rnd=random.Random(seed), held_karp_max_nodes=HELD_KARP_MAX_NODES,
+                                   batched_evaluation=batched)
+        if batched and not ng.batched_evaluation: continue
+        for operator in (BATCHED_OPERATORS if batched else LOCAL_SEARCH_OPERATORS):
+            method = getattr(ng, operator)
+            call = _held_karp_call(ng, data, start_solution) if operator == 'held_karp_reorder' else lambda: method(start_solution)
+            best, mean, solution = _time_call(call, repeat)
+            label = f"operator[{operator}{' batched' if batched else ''}]"
+            rows.append(_row(label, name, best, mean, score=solution.score))
+        if not batched:
+            ng.random.seed(seed)
+            best, mean, _ = _time_call(lambda: ng.random_modify(start_solution), repeat)
+            rows.append(_row('operator[random_modify]', name, best, mean))
+
+    params = dict(DEFAULT_PARAMS, max_iterations=vns_iterations, max_time=float('inf'),
+                  vns_stagnation_limit=float('inf'), use_upper_bound=False)
+    def run_vns():
+        return run_vns_parametrized(data, start_solution, random.Random(seed), params, time.time(), verbose=False)
+    best, mean, solution = _time_call(run_vns, max(1, repeat // 2), min_time=0)
+    rows.append(_row(f"vns[{vns_iterations} iterations]", name, best, mean, score=solution.score))
+    return rows
+
+
+def compare_to_baseline(rows, baseline_rows, tolerance=0.2):
+    """
+    Vergleicht mit einer gespeicherten Baseline (gleiche Benchmarks und Instanzen).
+    Regression: mehr als `tolerance` (relativ) langsamer, oder ein anderer Score bei gleichem Seed (Verhalten hat sich geändert).
+    Rückgabe: Liste von Meldungen (leer = keine Regression)
+    """
+    baseline = {(row['benchmark'], row['instance']): row for row in baseline_rows}
+    regressions = []
+    for row in rows:
+        reference = baseline.get((row['benchmark'], row['instance']))
+        if reference is None: continue
+        ratio = row['seconds'] / reference['seconds'] if reference['seconds'] > 0 else 1.0
+        row['baseline_ratio'] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(f"{row['benchmark']} auf {row['instance']}: {ratio:.2f}x langsamer "
+                               f"({reference['seconds'] * 1e3:.3f} ms -> {row['seconds'] * 1e3:.3f} ms)")
+        if 'score' in row and 'score' in reference and row['score'] != reference['score']:
+            regressions.append(f"{row['benchmark']} auf {row['instance']}: Score {reference['score']} -> {row['score']}")
+    return regressions
+
+
+def run_benchmarks(instances=None, repeat=5, vns_iterations=20, seed=1, verbose=True):
+    """Führt die Benchmarks für alle Instanzen aus und gibt das Ergebnis-Dict (Metadaten + Zeilen) zurück."""
+    rows = []
+    for path in instances or DEFAULT_INSTANCES:
+        if verbose:
+            print(f"Benchmark {os.path.basename(path)} ...", flush=True)
+        rows.extend(benchmark_instance(path, repeat, vns_iterations, seed))
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': repeat,
+            'vns_iterations': vns_iterations,
+            'seed': seed,
+        },
+        'results': rows,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks für Bewertung, Operatoren, Konstruktionsheuristiken und VNS.")
+    parser.add_argument('instances', nargs='*', help="Instanzdateien (Standard: Instanzen/Instance_1..5.json)")
+    parser.add_argument('--repeat', type=int, default=5, help="Wiederholungen pro Benchmark (gewertet wird das Minimum)")
+    parser.add_argument('--vns-iterations', type=int, default=20, help="Iterationen des VNS-Benchmarks")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--synthetic', type=int, nargs='*', default=[], metavar='NODES',
+                        help="Zusätzlich synthetische Instanzen dieser Größen (uniform/clustered/ring, Seed 0, siehe InstanceGenerator.py)")
+    parser.add_argument('--output', help="Ergebnis als JSON schreiben")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Gespeicherte Baseline für den Regressionsvergleich")
+    parser.add_argument('--save-baseline', action='store_true', help="Ergebnis als neue Baseline speichern")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Erlaubte relative Verlangsamung gegenüber der Baseline")
+    args = parser.parse_args(argv)
+
+    instances = args.instances or list(DEFAULT_INSTANCES)
+    if args.synthetic:
+        # Immer mit Seed 0 erzeugt: dieselben Dateien auf jedem Rechner, Ergebnisse bleiben mit der Baseline vergleichbar
+        instances += generate_scaling_set(SYNTHETIC_DIR, args.synthetic, seed=0)
+    report = run_benchmarks(instances, args.repeat, args.vns_iterations, args.seed)
+    for row in report['results']:
+        score = f"  score={row['score']}" if 'score' in row else ''
+        print(f"{row['instance']:<14}{row['benchmark']:<52}{row['seconds'] * 1e3:>12.3f} ms{score}")
+
+    regressions = []
+    status = 0
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        print(f"Baseline gespeichert: {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            regressions = compare_to_baseline(report['results'], json.load(file)['results'], args.tolerance)
+        report['regressions'] = regressions
+        if regressions:
+            print(f"{len(regressions)} Regression(en) gegenüber {args.baseline}:")
+            for message in regressions:
+                print(f"  - {message}")
+        else:
+            print(f"Keine Regressionen gegenüber {args.baseline}")
+    else:
+        # Ohne Baseline wurde nichts verglichen / eigener Exit-Status, damit CI das nicht als bestanden wertet
+        print(f"Keine Baseline unter {args.baseline}, es wurde nichts verglichen. "
+              f"Baseline anlegen mit: python Benchmark.py --save-baseline", file=sys.stderr)
+        status = EXIT_NO_BASELINE
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+    return EXIT_REGRESSION if regressions else status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
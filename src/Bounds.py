@@ -0,0 +1,100 @@
+def fractional_knapsack(items, capacity):
+    """
+    LP-Relaxation des Rucksackproblems: Items (Gewicht, Wert) nach Wert pro Gewicht absteigend packen, das letzte anteilig.
+    Liefert eine obere Schranke für den 0/1-Rucksack mit derselben Kapazität.
+    """
+    if capacity <= 0: return 0.0
+    items = sorted(items, key=lambda item: -item[1] / item[0] if item[0] > 0 else float('-inf'))
+    upper = 0.0
+    for weight, value in items:
+        if weight <= capacity:
+            capacity -= weight
+            upper += value
+        else:
+            upper += value * capacity / weight
+            break
+    return upper
+
+
+def compute_upper_bound(input_data):
+    """
+    Berechnet eine gültige obere Schranke für den erreichbaren Score einer Instanz (Ersatz für die alten fest eingetragenen optimal_scores).
+
+    Relaxation:
+      1. Nur Knoten k mit Depot -> k -> Depot <= TimeLimit können überhaupt besucht werden.
+      2. In jeder Tour hat jeder besuchte Knoten genau zwei Kanten. Die Tourlänge ist deshalb mindestens die Summe über alle
+         besuchten Knoten (inkl. Depot) der Hälfte ihrer zwei kürzesten möglichen Kanten.
+         Möglich heißt: Eine Tour Depot -> k -> Depot nutzt die Kante (Depot, k) zweimal. Für einen Kunden zählt das Depot
+         deshalb als zwei Nachbarn, für das Depot kann die kürzeste Kante beide Kanten stellen (Gewicht = kürzeste Kante).
+         Ohne das wäre die Einkunden-Tour unterschätzt und die Schranke ungültig (Depot (0,0), Knoten (1,0) mit Score 100,
+         Knoten (-1.2,0), TimeLimit 2.5: früher 87, die Tour [1, 2, 1] erreicht aber 100).
+      3. Mit diesen Gewichten und dem TimeLimit als Kapazität ergibt der fraktionale Rucksack eine Schranke für den Score.
+    Scores sind ganzzahlig, daher wird abgerundet.
+    """
+    dist = input_data.distance_matrix
+    time_limit = input_data.time_limit
+    depot_row = dist[0]
+
+    reachable = [k for k in range(1, input_data.node_count) if depot_row[k] + dist[k][0] <= time_limit]
+    if not reachable: return 0
+
+    # Depot doppelt: beide Kanten eines Kunden dürfen zum Depot führen
+    ends = reachable + [0, 0]
+    def half_two_shortest(k):
+        row = dist[k]
+        first = second = float('inf')
+        for j in ends:
+            if j == k: continue
+            d = row[j]
+            if d < first:
+                second = first
+                first = d
+            elif d < second:
+                second = d
+        return (first + second) / 2
+
+    items = [(half_two_shortest(k), input_data.nodes[k].score) for k in reachable]
+    # Depot: im ungünstigsten Fall gehen beide Kanten zum nächsten Kunden
+    capacity = time_limit - min(depot_row[k] for k in reachable)
+    upper = min(fractional_knapsack(items, capacity), sum(score for _, score in items))
+    return int(upper + 1e-9)
+
+
+def optimality_gap(score, upper_bound):
+    """Relative Lücke zwischen Lösung und oberer Schranke (0.0 = bewiesen optimal)."""
+    if upper_bound is None or upper_bound <= 0: return 0.0
+    return max(0.0, (upper_bound - score) / upper_bound)
+
+
+if __name__ == '__main__':
+    # Regressionsprüfung: Schranke >= beweisbar optimaler Score (ExactSolver) auf Mini-Instanzen und Instance_2
+    import json
+    import os
+    import tempfile
+    from InputData import InputData
+    from ExactSolver import solve_exact
+
+    def _instance(time_limit, nodes):
+        """Instanz aus (x, y, score)-Tupeln, der erste ist das Depot."""
+        data = {"Name": "check", "TimeLimit": time_limit, "NodeCount": len(nodes),
+                "Nodes": [{"Id": i + 1, "X": x, "Y": y, "Score": score} for i, (x, y, score) in enumerate(nodes)]}
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as file:
+            json.dump(data, file)
+        try:
+            return InputData(file.name)
+        finally:
+            os.remove(file.name)
+
+    cases = {
+        'Einkunden-Tour': _instance(2.5, [(0, 0, 0), (1, 0, 100), (-1.2, 0, 1)]),
+        'Depot-Rückweg': _instance(4.0, [(0, 0, 0), (2, 0, 50), (0, 3, 10), (0, -3, 10)]),
+        'Instance_2': InputData(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Instanzen', 'Instance_2.json')),
+    }
+    failed = 0
+    for name, data in cases.items():
+        solution, proven = solve_exact(data)
+        upper = compute_upper_bound(data)
+        ok = proven and upper >= solution.score
+        failed += not ok
+        print(f"{name:<16} Optimum {solution.score:<6} Schranke {upper:<6} {'ok' if ok else 'FEHLER'}")
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,106 @@
+import os
+import pickle
+import zlib
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path, state):
+    """
+    Schreibt den Suchzustand kompakt (pickle + zlib) auf die Platte.
+    Erst in eine temporäre Datei, dann atomar umbenennen: ein Abbruch mitten im Schreiben hinterlässt nie eine kaputte Datei.
+    """
+    payload = zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), 1)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(payload)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    """Liest einen mit `save_checkpoint` geschriebenen Zustand wieder ein."""
+    with open(path, 'rb') as file:
+        state = pickle.loads(zlib.decompress(file.read()))
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Checkpoint-Version {state.get('version')} wird nicht unterstützt (erwartet {CHECKPOINT_VERSION}).")
+    return state
+
+
+def capture_state(input_data, params, start_solution, current, best, pool, rnd, counters, elapsed, selectors=None, registry=None):
+    """
+    Baut aus den Variablen der VNS-Schleife einen reinen Daten-Zustand (nur Listen, Zahlen, Dicts).
+    Touren werden ohne Kenngrößen gespeichert, Score/Distanz werden beim Laden deterministisch neu berechnet.
+    Der Pool wird in der Reihenfolge "beste zuerst" gespeichert, so ergibt das erneute Einfügen exakt dieselbe Ordnung.
+    selectors: optionale Zustände der adaptiven Operatorauswahl (Gewichte und Zähler, siehe AdaptiveSelection.py)
+    registry: optionaler Zustand des Gedächtnisses bekannter lokaler Optima (siehe LocalOptimaRegistry.get_state)
+    """
+    return {
+        'version': CHECKPOINT_VERSION,
+        'instance': input_data.name,
+        'node_count': input_data.node_count,
+        'params': dict(params),
+        'start_tour': list(start_solution.tour),
+        'current': list(current.tour),
+        'best': list(best.tour),
+        'pool': [list(solution.tour) for solution in pool],
+        'random_state': rnd.getstate(),
+        'counters': dict(counters),
+        'elapsed': elapsed,
+        'selectors': selectors,
+        'registry': registry,
+    }
+
+
+def check_instance(state, input_data):
+    """Stellt sicher, dass ein Zustand zur geladenen Instanz passt."""
+    if state['instance'] != input_data.name or state['node_count'] != input_data.node_count:
+        raise ValueError(f"Checkpoint gehört zu Instanz '{state['instance']}' ({state['node_count']} Knoten), "
+                         f"geladen ist '{input_data.name}' ({input_data.node_count} Knoten).")
+
+
+if __name__ == '__main__':
+    # Regressionsprüfung: Unterbrechen + Fortsetzen ergibt unter Bewertungsbudget denselben Lauf wie ohne Unterbrechung
+    # (mit Gedächtnis bekannter lokaler Optima, einmal mit fester und einmal mit adaptiver VND-Reihenfolge inkl. Gewichten)
+    import random
+    import tempfile
+    from InputData import InputData
+    from StartSolutionSelector import select_best_start_solution
+    from VNS import DEFAULT_PARAMS, run_vns_parametrized, resume_vns
+
+    instance_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Instanzen', 'Instance_1.json')
+
+    def _run(params, stop_at=None, path=None):
+        data = InputData(instance_path)
+        rnd = random.Random(3)
+        start_solution, _ = select_best_start_solution(data, rnd=rnd)
+        params = dict(params)
+        if stop_at is not None:
+            params.update(max_iterations=stop_at, checkpoint_path=path, checkpoint_interval=0.0)
+        run_info = {}
+        solution = run_vns_parametrized(data, start_solution, rnd, params, 0, verbose=False, run_info=run_info)
+        return solution, run_info
+
+    cases = {
+        'feste VND': ({'local_optima_cache_size': 5000}, 150),
+        'adaptive VND': ({'adaptive_operators': True}, 60),
+    }
+    failed = 0
+    for name, (extra, stop_at) in cases.items():
+        params = dict(DEFAULT_PARAMS, max_evaluations=300000, use_upper_bound=False, capture_state=True, **extra)
+        full, full_info = _run(params)
+        path = os.path.join(tempfile.mkdtemp(), 'resume.ckpt')
+        _run(params, stop_at, path)
+        state = load_checkpoint(path)
+        del state['params']['max_iterations']
+        save_checkpoint(path, state)
+        resumed_info = {}
+        resumed = resume_vns(InputData(instance_path), path, verbose=False, run_info=resumed_info)
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
+        ok = (full.tour == resumed.tour and full_info['iterations'] == resumed_info['iterations']
+              and full_info['restarts'] == resumed_info['restarts']
+              and full_info['state']['random_state'] == resumed_info['state']['random_state']
+              and full_info.get('operator_weights') == resumed_info.get('operator_weights'))
+        failed += not ok
+        print(f"{name:<14} Iterationen {full_info['iterations']} / fortgesetzt {resumed_info['iterations']}  {'ok' if ok else 'FEHLER'}")
+    raise SystemExit(1 if failed else 0)
@@ -3,40 +3,41 @@ from OutputData import TourSolution
 from math import atan2
 
 
-def generate_solution(input_data, method, top_k=3, cluster_size=35, seed=None , rnd = None):
+def generate_solution(input_data, method, top_k=3, cluster_size=35, seed=None , rnd = None, deadline=None):
     """
     Eine Factory-Funktion, die basierend auf dem 'method'-String die passende konstruktive Heuristik aufruft, um eine Startlösung zu erzeugen.
     Stellt sicher, dass ein gültiges `random.Random`-Objekt an alle stochastischen Methoden weitergereicht wird (Reproduzierbarkeit)
+    Mit `deadline` (siehe Deadline.py) brechen die Heuristiken bei Zeitablauf ab und geben die bis dahin gebaute, gültige Tour zurück.
     """
 
     if rnd is None:
         rnd = random.Random(seed)
 
     if method == "greedy":
-        return greedy_solution(input_data)
+        return greedy_solution(input_data, deadline=deadline)
     elif method == "random":
-        return random_solution(input_data, rnd=rnd)
+        return random_solution(input_data, rnd=rnd, deadline=deadline)
     elif method == "randomized_greedy":
-        return randomized_greedy_solution(input_data, top_k, rnd=rnd)
+        return randomized_greedy_solution(input_data, top_k, rnd=rnd, deadline=deadline)
     elif method == "best_insertion":
-        return best_insertion_solution(input_data)
+        return best_insertion_solution(input_data, deadline=deadline)
     elif method == "clustered_greedy":
-        return clustered_greedy_solution(input_data, cluster_size)
+        return clustered_greedy_solution(input_data, cluster_size, deadline=deadline)
     elif method == "shortest_path":
-        return shortest_path_solution(input_data)
+        return shortest_path_solution(input_data, deadline=deadline)
     elif method == "efficiency":
-        return efficiency_direct_solution(input_data)
+        return efficiency_direct_solution(input_data, deadline=deadline)
     elif method == "randomized_best_insertion":
-        return randomized_best_insertion_solution(input_data, top_k, rnd=rnd)
+        return randomized_best_insertion_solution(input_data, top_k, rnd=rnd, deadline=deadline)
     elif method == "greedy_shuffle":
-        return greedy_shuffle_start_solution(input_data, rnd=rnd)
+        return greedy_shuffle_start_solution(input_data, rnd=rnd, deadline=deadline)
     else:
         raise ValueError(f"Unbekannte Methode: {method}")
 
 
 
 # Greedy: Nächsten Knoten mit bestem Score/Distanz-Verhältnis
-def greedy_solution(input_data):
+def greedy_solution(input_data, deadline=None):
     """
     Erzeugt eine Tour nach einem greedy Kriterium. 
     In jedem Schritt wird der unbesuchte Knoten mit dem besten Verhältnis von Score zu Reisekosten
@@ -48,11 +49,13 @@ def greedy_solution(input_data):
     remaining = set(n.id for n in input_data.nodes if n.id != 1)
     time = 0.0
 
-    while remaining:
+    while remaining and not _expired(deadline):
         best = None
         best_value = -1
         # KORREKTUR: Iteriere über eine sortierte Liste für deterministisches Verhalten.
         for node_id in sorted(list(remaining)):
+            if _time_up(deadline):
+                break
             dist = input_data.get_distance(current_id, node_id) + input_data.get_distance(node_id, 1)
             if time + dist > input_data.time_limit:
                 continue
@@ -76,7 +79,7 @@ def greedy_solution(input_data):
     return solution
 
 # Random: wähle zufällig Knoten, solange gültig
-def random_solution(input_data, rnd):
+def random_solution(input_data, rnd, deadline=None):
     current_id = 1
     tour = [current_id]
     remaining = list(n.id for n in input_data.nodes if n.id != 1)
@@ -84,6 +87,8 @@ def random_solution(input_data, rnd):
     time = 0.0
 
     for node_id in remaining:
+        if _time_up(deadline):
+            break
         dist = input_data.get_distance(current_id, node_id) + input_data.get_distance(node_id, 1)
         if time + dist > input_data.time_limit:
             continue
@@ -99,7 +104,7 @@ def random_solution(input_data, rnd):
 
 
 # Randomized Greedy: zufällige Auswahl aus Top-k besten Knoten
-def randomized_greedy_solution(input_data, k, rnd):
+def randomized_greedy_solution(input_data, k, rnd, deadline=None):
     """
     Statt immer den absolut besten nächsten Knoten zu wählen, wird eine
     Kandidatenliste der 'k' besten nächsten Knoten erstellt. Aus dieser Liste
@@ -111,10 +116,12 @@ def randomized_greedy_solution(input_data, k, rnd):
     remaining = set(n.id for n in input_data.nodes if n.id != 1)
     time = 0.0
 
-    while remaining:
+    while remaining and not _expired(deadline):
         candidates = []
         # KORREKTUR: Iteriere über eine sortierte Liste für deterministisches Verhalten.
         for node_id in sorted(list(remaining)):
+            if _time_up(deadline):
+                break
             dist = input_data.get_distance(current_id, node_id) + input_data.get_distance(node_id, 1)
             if time + dist > input_data.time_limit:
                 continue
@@ -140,7 +147,7 @@ def randomized_greedy_solution(input_data, k, rnd):
 
 
 # Best Insertion: füge Knoten an beste Stelle der Tour ein
-def best_insertion_solution(input_data):
+def best_insertion_solution(input_data, deadline=None):
     """
     Baut eine Tour iterativ auf. Beginnt mit einer minimalen Tour (Depot -> Depot).
     In jedem Schritt wird derjenige unbesuchte Knoten gesucht, der an der
@@ -151,13 +158,15 @@ def best_insertion_solution(input_data):
     tour = [1, 1]
     remaining = set(n.id for n in input_data.nodes if n.id != 1)
 
-    while remaining:
+    while remaining and not _expired(deadline):
         best_node = None
         best_pos = None
         best_increase = float('inf')
 
         #Iterierung über eine sortierte Liste für deterministisches Verhalten.
         for node_id in sorted(list(remaining)):
+            if _time_up(deadline):
+                break
             for i in range(1, len(tour)):
                 before = tour[i - 1]
                 after = tour[i]
@@ -188,7 +197,7 @@ def best_insertion_solution(input_data):
 
 
 # Clustering + Greedy: teile in Cluster, löse lokal greedy / Verworfen / War schon als Idee hat aber gar nicht geklappt
-def clustered_greedy_solution(input_data, cluster_size):
+def clustered_greedy_solution(input_data, cluster_size, deadline=None):
     depot = next(n for n in input_data.nodes if n.id == 1)
     nodes = [n for n in input_data.nodes if n.id != 1]
     nodes.sort(key=lambda n: atan2(n.y - depot.y, n.x - depot.x))
@@ -200,10 +209,12 @@ def clustered_greedy_solution(input_data, cluster_size):
 
     for cluster in clusters:
         local_nodes = set(n.id for n in cluster)
-        while local_nodes:
+        while local_nodes and not _expired(deadline):
             best = None
             best_value = -1
             for node_id in sorted(list(local_nodes)):
+                if _time_up(deadline):
+                    break
                 dist = input_data.get_distance(current_id, node_id) + input_data.get_distance(node_id, 1)
                 if time + dist > input_data.time_limit:
                     continue
@@ -225,11 +236,11 @@ def clustered_greedy_solution(input_data, cluster_size):
     return solution
 
 #Verworfen / Lange Touren aber sehr schlechte 
-def shortest_path_solution(input_data):
+def shortest_path_solution(input_data, deadline=None):
     tour = [1]
     remaining = set(node.id for node in input_data.nodes if node.id != 1)
 
-    while remaining:
+    while remaining and not _expired(deadline):
         last = tour[-1]
         
         
@@ -237,6 +248,8 @@ def shortest_path_solution(input_data):
         
         found_next = False
         for next_node in sorted_remaining:
+            if _time_up(deadline):
+                break
             new_tour = tour + [next_node, 1]
             solution = TourSolution(new_tour, input_data.time_limit)
             solution.evaluate(input_data)
@@ -256,16 +269,18 @@ def shortest_path_solution(input_data):
     return final_solution
 
 # Verworfen / Hat leider schlechte Startlösungen gebracht 
-def efficiency_direct_solution(input_data):
+def efficiency_direct_solution(input_data, deadline=None):
     tour = [1]
     remaining = set(node.id for node in input_data.nodes if node.id != 1)
 
-    while remaining:
+    while remaining and not _expired(deadline):
         best_ratio = -1
         best_node = None
 
         # KORREKTUR: Iteriere über eine sortierte Liste für deterministisches Verhalten.
         for nid in sorted(list(remaining)):
+            if _time_up(deadline):
+                break
             dist = input_data.get_distance(tour[-1], nid)
             score = input_data.nodes[nid - 1].score
             if dist > 0:
@@ -291,14 +306,16 @@ def efficiency_direct_solution(input_data):
 
 
 # Randomized Best Insertion: Wähle zufällig aus Top-K Einfügeoptionen / Wird noch manchmal aus mögliche Restart Lösung für Diversität verwendet
-def randomized_best_insertion_solution(input_data, top_k, rnd):
+def randomized_best_insertion_solution(input_data, top_k, rnd, deadline=None):
     nodes = input_data.nodes.copy()
     unvisited = set(node.id for node in nodes if node.id != 1)
     tour = [1, 1]
 
-    while unvisited:
+    while unvisited and not _expired(deadline):
         candidates = []
         for node_id in sorted(list(unvisited)):
+            if _time_up(deadline):
+                break
             for i in range(1, len(tour)):
                 new_tour = tour[:i] + [node_id] + tour[i:]
                 sol = TourSolution(new_tour, input_data.time_limit)
@@ -326,7 +343,7 @@ def randomized_best_insertion_solution(input_data, top_k, rnd):
 
 
 # Greedy mit zufälligem Startknoten  / Wollte ich als restart Lösung verwenden um neue Pool Solutions zu ermöglichen die anders augebraut sind. Hat aber nicht funktioniert und wurde verworfen
-def greedy_shuffle_start_solution(input_data, rnd):
+def greedy_shuffle_start_solution(input_data, rnd, deadline=None):
     nodes = input_data.nodes.copy()
     start_candidates = [node for node in nodes if node.id != 1]
     start_node = rnd.choice(start_candidates)
@@ -335,12 +352,14 @@ def greedy_shuffle_start_solution(input_data, rnd):
     time_limit = input_data.time_limit
     remaining = set(node.id for node in nodes if node.id not in tour)
 
-    while remaining:
+    while remaining and not _expired(deadline):
         best_ratio = -1
         best_node = None
         
         
         for node_id in sorted(list(remaining)):
+            if _time_up(deadline):
+                break
             full_tour = tour + [node_id, 1]
             total = compute_total_distance(full_tour, input_data)
             
@@ -366,6 +385,14 @@ def greedy_shuffle_start_solution(input_data, rnd):
     return sol
 
 
+# Hilfsfunktionen für das kooperative Zeitlimit (siehe Deadline.py) / ohne Deadline laufen die Heuristiken wie bisher komplett durch
+def _time_up(deadline):
+    return deadline is not None and deadline.poll()
+
+def _expired(deadline):
+    return deadline is not None and deadline.expired()
+
+
 # Hilfsfunktion: berechne Tourdistanz
 def compute_total_distance(tour, input_data):
     return sum(input_data.get_distance(tour[i], tour[i+1]) for i in range(len(tour)-1))
\ No newline at end of file
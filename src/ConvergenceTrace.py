@@ -0,0 +1,78 @@
+import csv
+import gzip
+from array import array
+
+# Ereignis-Bits pro Eintrag (können kombiniert auftreten)
+EVENT_NEW_BEST = 1
+EVENT_RESTART = 2
+
+TRACE_FIELDS = ['timestamp', 'iteration', 'current_score', 'best_score', 'current_distance', 'best_distance', 'event', 'pool_size']
+_TYPECODES = ['d', 'q', 'q', 'q', 'd', 'd', 'b', 'l']
+
+
+class ConvergenceTrace:
+    """
+    Verlauf der VNS (Score über Zeit) in einem vorab angelegten Ringpuffer.
+    Eine typisierte Spalte (array) pro Feld mit fester Kapazität: Aufzeichnen schreibt nur an eine Indexposition, es wird nie Speicher nachgefordert.
+    Ist der Puffer voll, werden die ältesten Einträge überschrieben (`dropped` zählt sie).
+
+    timestamp: Sekunden seit dem globalen Startzeitpunkt / event: Bits EVENT_NEW_BEST, EVENT_RESTART
+    """
+    def __init__(self, capacity=100000):
+        self.capacity = capacity
+        self._columns = [array(code, [0]) * capacity for code in _TYPECODES]
+        self.count = 0  # Anzahl aller jemals aufgezeichneten Einträge
+
+    def record(self, timestamp, iteration, current, best, pool_size, event=0):
+        index = self.count % self.capacity
+        timestamps, iterations, current_scores, best_scores, current_distances, best_distances, events, pool_sizes = self._columns
+        timestamps[index] = timestamp
+        iterations[index] = iteration
+        current_scores[index] = current.score
+        best_scores[index] = best.score
+        current_distances[index] = current.total_distance
+        best_distances[index] = best.total_distance
+        events[index] = event
+        pool_sizes[index] = pool_size
+        self.count += 1
+
+    @property
+    def dropped(self):
+        """Anzahl überschriebener (verlorener) Einträge."""
+        return max(0, self.count - self.capacity)
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def rows(self):
+        """Alle gespeicherten Einträge in zeitlicher Reihenfolge als Tupel (Reihenfolge wie TRACE_FIELDS)."""
+        start = self.count % self.capacity if self.count > self.capacity else 0
+        indices = [(start + i) % self.capacity for i in range(len(self))]
+        return [tuple(column[i] for column in self._columns) for i in indices]
+
+    def dump(self, path):
+        """Schreibt den Verlauf als gzip-komprimierte CSV (lässt sich direkt mit pandas.read_csv lesen)."""
+        with gzip.open(path, 'wt', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(TRACE_FIELDS)
+            writer.writerows(self.rows())
+
+
+def load_trace(path):
+    """Liest einen mit `ConvergenceTrace.dump` geschriebenen Verlauf als Liste von Dicts."""
+    with gzip.open(path, 'rt', newline='', encoding='utf-8') as file:
+        reader = csv.DictReader(file)
+        return [{field: (float(value) if code == 'd' else int(value)) for (field, value), code in zip(row.items(), _TYPECODES)}
+                for row in reader]
+
+
+def time_to_target(rows, target_score):
+    """
+    Zeit (Sekunden), bis die beste Lösung erstmals mindestens `target_score` erreicht / None, wenn nie erreicht.
+    rows: Ergebnis von `load_trace` oder `ConvergenceTrace.rows()`.
+    """
+    for row in rows:
+        best_score = row['best_score'] if isinstance(row, dict) else row[3]
+        if best_score >= target_score:
+            return row['timestamp'] if isinstance(row, dict) else row[0]
+    return None
@@ -0,0 +1,115 @@
+import time
+
+
+class Deadline:
+    """
+    Kooperatives Zeitlimit auf Basis der monotonen Uhr (time.monotonic springt nicht bei Zeitumstellung/NTP).
+    Wird durch VNS, NeighborhoodGenerator und die konstruktiven Heuristiken durchgereicht.
+    Lange Schleifen rufen pro Nachbar-Bewertung `poll()` auf, das nur jede `check_every`-te Abfrage wirklich die Uhr liest.
+    Ist die Zeit abgelaufen, geben die Operatoren ihre bis dahin beste Lösung zurück.
+    Die Überschreitung des Budgets ist damit auf ca. `check_every` Bewertungen begrenzt und wird über `overrun` gemessen.
+
+    clock: Uhr der Deadline / Standard time.monotonic (Wandzeit), time.process_time misst CPU-Zeit dieses Prozesses
+           (z. B. BatchScheduler.py, dessen Gesamtbudget CPU-Zeit ist). `start` ist ein Wert dieser Uhr.
+    """
+    def __init__(self, seconds, start=None, check_every=64, clock=time.monotonic):
+        self.seconds = seconds
+        self.clock = clock
+        self.start = clock() if start is None else start
+        self.end = self.start + seconds
+        self.check_every = check_every
+        self._countdown = check_every
+        self._expired = False
+        self.finished_at = None
+
+    @classmethod
+    def from_wall_clock(cls, global_start_time, seconds, check_every=64):
+        """
+        Erzeugt eine Deadline aus einem time.time()-Startzeitpunkt (so wie `global_start_time` im Notebook).
+        Die bereits verstrichene Zeit wird einmalig umgerechnet, danach zählt nur noch die monotone Uhr.
+        """
+        elapsed = max(0.0, time.time() - global_start_time)
+        return cls(seconds, start=time.monotonic() - elapsed, check_every=check_every)
+
+    def poll(self):
+        """Billige Prüfung für innere Schleifen. Liest die Uhr nur jede `check_every`-te Abfrage."""
+        if self._expired: return True
+        self._countdown -= 1
+        if self._countdown > 0: return False
+        self._countdown = self.check_every
+        return self.expired()
+
+    def charge(self, count):
+        """Meldet `count` Bewertungen auf einmal (gebündelte Auswertung mit NumPy) / bei der Zeit-Deadline wie ein poll()."""
+        return self.poll()
+
+    def expired(self):
+        """Exakte Prüfung (liest immer die Uhr). Einmal abgelaufen bleibt die Deadline abgelaufen."""
+        if not self._expired and self.clock() >= self.end:
+            self._expired = True
+        return self._expired
+
+    def elapsed(self):
+        """Verstrichene Sekunden seit dem Start."""
+        return self.clock() - self.start
+
+    def remaining(self):
+        """Verbleibende Sekunden bis zur Deadline (nie negativ)."""
+        return max(0.0, self.end - self.clock())
+
+    def finish(self):
+        """Hält das Ende des Laufs fest und gibt die gemessene Überschreitung in Sekunden zurück."""
+        self.finished_at = self.clock()
+        return self.overrun
+
+    @property
+    def overrun(self):
+        """Wie weit der Lauf über das Budget hinaus gelaufen ist (0.0, wenn er rechtzeitig fertig war)."""
+        now = self.finished_at if self.finished_at is not None else self.clock()
+        return max(0.0, now - self.end)
+
+
+class EvaluationBudget:
+    """
+    Budget in Nachbar-Bewertungen statt Sekunden, mit derselben Schnittstelle wie Deadline (poll, charge, expired, finish ...).
+    Jeder poll() zählt eine Bewertung (die Operatoren und Heuristiken rufen ihn pro Bewertung auf), charge(n) zählt n auf einmal.
+    Abgelaufen ist das Budget, sobald `max_evaluations` Bewertungen gezählt sind. Ohne Blick auf die Uhr endet ein Lauf damit
+    auf jedem Rechner an derselben Stelle: gleiche Seeds und Parameter ergeben überall dieselbe Lösung (Benchmarks, Regressionstests).
+
+    elapsed() misst trotzdem die Wandzeit (nur zur Information, z. B. VNSProgress.elapsed).
+    remaining() und overrun zählen Bewertungen statt Sekunden.
+    """
+    check_every = 1
+
+    def __init__(self, max_evaluations):
+        self.max_evaluations = max_evaluations
+        self.evaluations = 0
+        self.start = time.monotonic()
+        self.finished_at = None
+
+    def poll(self):
+        self.evaluations += 1
+        return self.evaluations >= self.max_evaluations
+
+    def charge(self, count):
+        self.evaluations += count
+        return self.evaluations >= self.max_evaluations
+
+    def expired(self):
+        return self.evaluations >= self.max_evaluations
+
+    def elapsed(self):
+        return time.monotonic() - self.start
+
+    def remaining(self):
+        """Verbleibende Bewertungen (nie negativ)."""
+        return max(0, self.max_evaluations - self.evaluations)
+
+    def finish(self):
+        self.finished_at = time.monotonic()
+        return self.overrun
+
+    @property
+    def overrun(self):
+        """Wie viele Bewertungen über das Budget hinaus gezählt wurden (z. B. Rest einer gebündelten Auswertung)."""
+        return max(0, self.evaluations - self.max_evaluations)
@@ -0,0 +1,365 @@
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+from ExperimentRunner import expand_jobs, load_spec, print_row, run_job
+from ResultsSink import ResultsSink, read_rows
+
+# Protokoll: eine JSON-Nachricht pro Zeile (UTF-8) über eine TCP-Verbindung pro Worker.
+#   Worker -> Koordinator                                 Antwort
+#   {"op": "get", "worker": id}                           {"job": {...}, "lease": s} / {"wait": s} / {"done": true}
+#   {"op": "result", "worker": id, "row": {...}}          {"ok": true}
+#   {"op": "heartbeat", "worker": id}                     keine (verlängert die Leases des Workers)
+# Kein Pickle, keine Authentifizierung: nur in vertrauenswürdigen Netzen betreiben. Die Instanzpfade der Jobs
+# müssen auf allen Rechnern gültig sein (gemeinsames Laufwerk oder gleiche Ordnerstruktur).
+DEFAULT_PORT = 5555
+
+
+class JobQueue:
+    """
+    Warteschlange des Koordinators, unabhängig vom Transport (Socket oder LocalConnection).
+    Ein ausgegebener Job gehört einem Worker für `lease_timeout` Sekunden, Heartbeats verlängern die Lease.
+    Bricht die Verbindung ab (worker_lost) oder läuft die Lease aus, kommt der Job vorne wieder in die Warteschlange.
+    Nach `max_attempts` verlorenen Versuchen wird er mit status 'error' abgeschlossen, statt endlos neu verteilt zu werden.
+    Ein verspätetes Ergebnis eines schon aufgegebenen Workers wird übernommen, sofern der Job noch nicht fertig ist.
+    """
+    def __init__(self, jobs, lease_timeout=120.0, max_attempts=3, on_result=None):
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.on_result = on_result
+        self.total = len(jobs)
+        self.results = {}
+        self._pending = deque(jobs)
+        self._leases = {}  # job_id -> [job, worker, Ablaufzeitpunkt]
+        self._attempts = Counter()
+        self._condition = threading.Condition()
+
+    def handle(self, worker, message):
+        """Verarbeitet eine Nachricht eines Workers und gibt die Antwort zurück (None bei Heartbeats)."""
+        op = message.get('op')
+        with self._condition:
+            self._expire_leases()
+            if op == 'get':
+                return self._next_job(worker)
+            if op == 'heartbeat':
+                expires = time.monotonic() + self.lease_timeout
+                for lease in self._leases.values():
+                    if lease[1] == worker:
+                        lease[2] = expires
+                return None
+            if op == 'result':
+                self._finish(message['row'])
+                return {'ok': True}
+        raise ValueError(f"Unbekannte Nachricht '{op}'")
+
+    def _next_job(self, worker):
+        if self._pending:
+            job = self._pending.popleft()
+            self._leases[job['job_id']] = [job, worker, time.monotonic() + self.lease_timeout]
+            return {'job': job, 'lease': self.lease_timeout}
+        if self._leases:
+            # Alles verteilt, aber noch nicht fertig: später nachfragen, falls ein Job neu verteilt werden muss
+            return {'wait': min(1.0, self.lease_timeout / 4)}
+        return {'done': True}
+
+    def _finish(self, row):
+        job_id = row['job_id']
+        if job_id in self.results: return
+        self._leases.pop(job_id, None)
+        if any(job['job_id'] == job_id for job in self._pending):
+            self._pending = deque(job for job in self._pending if job['job_id'] != job_id)
+        self.results[job_id] = row
+        if self.on_result is not None:
+            self.on_result(row)
+        self._condition.notify_all()
+
+    def _requeue(self, job, reason):
+        self._attempts[job['job_id']] += 1
+        if self._attempts[job['job_id']] >= self.max_attempts:
+            row = {key: job[key] for key in ('job_id', 'experiment', 'instance_path', 'seed', 'grid_point', 'params')}
+            row.update({'status': 'error', 'error': f"{reason} ({self.max_attempts} Versuche)", 'elapsed': 0.0,
+                        'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S')})
+            self._finish(row)
+        else:
+            self._pending.appendleft(job)
+
+    def _expire_leases(self):
+        now = time.monotonic()
+        for job_id, (job, worker, expires) in list(self._leases.items()):
+            if expires < now:
+                del self._leases[job_id]
+                self._requeue(job, f"Lease von Worker {worker} abgelaufen")
+
+    def worker_lost(self, worker):
+        """Gibt alle Jobs eines Workers zurück in die Warteschlange (Verbindung abgebrochen)."""
+        with self._condition:
+            for job_id, (job, owner, _) in list(self._leases.items()):
+                if owner == worker:
+                    del self._leases[job_id]
+                    self._requeue(job, f"Verbindung zu Worker {worker} verloren")
+
+    def finished(self):
+        with self._condition:
+            return len(self.results) >= self.total
+
+    def wait(self, timeout=None):
+        """Wartet, bis alle Jobs fertig sind (prüft dabei regelmäßig die Leases). Rückgabe: True, wenn fertig."""
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while len(self.results) < self.total:
+                if end is not None and time.monotonic() >= end: return False
+                self._condition.wait(1.0 if end is None else max(0.0, min(1.0, end - time.monotonic())))
+                self._expire_leases()
+            return True
+
+
+class LocalConnection:
+    """In-Prozess-Ersatz für die Socket-Verbindung (Tests, Debuggen): ruft JobQueue.handle direkt auf."""
+    def __init__(self, queue, worker):
+        self.queue = queue
+        self.worker = worker
+
+    def request(self, message):
+        # JSON-Umweg wie beim Socket: Worker und Koordinator teilen keine Objekte
+        return json.loads(json.dumps(self.queue.handle(self.worker, json.loads(json.dumps(message)))))
+
+    def send(self, message):
+        self.queue.handle(self.worker, message)
+
+    def close(self):
+        self.queue.worker_lost(self.worker)
+
+
+class SocketConnection:
+    """Verbindung eines Workers zum Koordinator (JSON-Zeilen über TCP, Heartbeats aus einem zweiten Thread)."""
+    def __init__(self, host, port, timeout=None):
+        self._socket = socket.create_connection((host, port), timeout=timeout)
+        self._file = self._socket.makefile('rwb')
+        self._lock = threading.Lock()
+
+    def _write(self, message):
+        self._file.write(json.dumps(message).encode('utf-8') + b'\n')
+        self._file.flush()
+
+    def request(self, message):
+        with self._lock:
+            self._write(message)
+            line = self._file.readline()
+        if not line:
+            raise ConnectionError("Koordinator hat die Verbindung geschlossen")
+        return json.loads(line)
+
+    def send(self, message):
+        with self._lock:
+            self._write(message)
+
+    def close(self):
+        try:
+            self._file.close()
+        finally:
+            self._socket.close()
+
+
+class _Heartbeat(threading.Thread):
+    """Sendet während eines Jobs regelmäßig Heartbeats, damit der Koordinator die Lease verlängert."""
+    def __init__(self, connection, worker, interval):
+        super().__init__(daemon=True)
+        self.connection = connection
+        self.worker = worker
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.connection.send({'op': 'heartbeat', 'worker': self.worker})
+            except OSError:
+                return
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop_event.set()
+        self.join()
+        return False
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}-{threading.get_ident()}"
+
+
+def run_worker(connection, worker=None, max_jobs=None, verbose=True):
+    """
+    Arbeitet Jobs des Koordinators ab, bis er 'done' meldet, die Verbindung abbricht oder `max_jobs` erreicht ist.
+    Die Instanzen bleiben über InputData.load_instance pro Prozess im Cache (run_job aus ExperimentRunner).
+    Rückgabe: Anzahl bearbeiteter Jobs
+    """
+    worker = worker or default_worker_id()
+    done = 0
+    try:
+        while max_jobs is None or done < max_jobs:
+            reply = connection.request({'op': 'get', 'worker': worker})
+            if reply.get('done'): break
+            if 'wait' in reply:
+                time.sleep(reply['wait'])
+                continue
+            job = reply['job']
+            with _Heartbeat(connection, worker, reply['lease'] / 3):
+                row = run_job(job)
+            row['worker'] = worker
+            connection.request({'op': 'result', 'worker': worker, 'row': row})
+            done += 1
+            if verbose:
+                print(f"Worker {worker}: {os.path.basename(job['instance_path'])} Seed {job['seed']} -> {row['status']}")
+    except (ConnectionError, OSError) as e:
+        if verbose:
+            print(f"Worker {worker}: Verbindung beendet ({e})")
+    return done
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        queue = self.server.queue
+        workers = set()
+        try:
+            for line in self.rfile:
+                message = json.loads(line)
+                workers.add(message.get('worker'))
+                reply = queue.handle(message.get('worker'), message)
+                if reply is not None:
+                    self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            for worker in workers:
+                queue.worker_lost(worker)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class Coordinator:
+    """
+    Verteilt Jobs (Instanz, Seed, Parameter) über TCP an Worker auf beliebig vielen Rechnern und schreibt jede
+    zurückkommende Zeile sofort in die Ergebnisdatei (JSON Lines, wie ExperimentRunner). Schon erfolgreich
+    in der Datei stehende Jobs werden nicht erneut verteilt.
+
+        with Coordinator(jobs, 'results.jsonl', host='0.0.0.0') as coordinator:
+            coordinator.wait()
+    """
+    def __init__(self, jobs, output_path, host='127.0.0.1', port=DEFAULT_PORT, lease_timeout=120.0, max_attempts=3, verbose=True):
+        self.output_path = output_path
+        self.verbose = verbose
+        done = {row['job_id'] for row in read_rows(output_path) if row.get('status') == 'ok'}
+        pending = [job for job in jobs if job['job_id'] not in done]
+        if verbose:
+            print(f"{len(jobs)} Jobs, {len(jobs) - len(pending)} schon erledigt, {len(pending)} offen -> {output_path}")
+        # Erst binden, dann die Ergebnisdatei öffnen: ist der Port belegt, bleibt keine offene (und reparierte) Datei zurück
+        self._server = _Server((host, port), _Handler)
+        try:
+            self._sink = ResultsSink(output_path)
+        except Exception:
+            self._server.server_close()
+            raise
+        self.queue = JobQueue(pending, lease_timeout, max_attempts, on_result=self._write)
+        self._server.queue = self.queue
+        self._thread = None
+
+    @property
+    def address(self):
+        """(Host, Port), auf dem der Koordinator lauscht (bei port=0 der vom System gewählte Port)."""
+        return self._server.server_address
+
+    def _write(self, row):
+        self._sink.write(row)
+        if self.verbose:
+            print_row(row, len(self.queue.results), self.queue.total)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        return self.queue.wait(timeout)
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._sink.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def run_local(jobs, output_path, workers=2, lease_timeout=120.0, max_attempts=3, verbose=True):
+    """
+    Lokaler Ersatz für Koordinator und Worker in einem Prozess (Worker als Threads, LocalConnection statt Socket).
+    Gleiche Warteschlange, gleiche Ergebnisdatei, gleiche Regeln für Leases und verlorene Worker, aber ohne Netzwerk.
+    Rückgabe: die JobQueue (results: job_id -> Zeile)
+    """
+    done = {row['job_id'] for row in read_rows(output_path) if row.get('status') == 'ok'}
+    pending = [job for job in jobs if job['job_id'] not in done]
+    with ResultsSink(output_path) as sink:
+        queue = JobQueue(pending, lease_timeout, max_attempts, on_result=sink.write)
+        threads = [threading.Thread(target=run_worker, args=(LocalConnection(queue, f"local-{i}"), f"local-{i}", None, verbose),
+                                    daemon=True) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        queue.wait()
+        for thread in threads:
+            thread.join()
+    return queue
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verteilte Experimente: Koordinator verteilt Jobs, Worker rechnen sie.")
+    sub = parser.add_subparsers(dest='mode', required=True)
+    coordinator = sub.add_parser('coordinator', help="Jobs einer Experiment-Spezifikation verteilen")
+    coordinator.add_argument('spec', help="Experiment-Spezifikation (JSON, siehe ExperimentRunner.expand_jobs)")
+    coordinator.add_argument('--output', help="Ergebnisdatei (JSON Lines), Standard: 'output' aus der Spezifikation")
+    coordinator.add_argument('--host', default='127.0.0.1', help="Adresse zum Lauschen (0.0.0.0 für andere Rechner)")
+    coordinator.add_argument('--port', type=int, default=DEFAULT_PORT)
+    coordinator.add_argument('--lease', type=float, default=120.0, help="Sekunden ohne Heartbeat, bis ein Job neu verteilt wird")
+    worker = sub.add_parser('worker', help="Jobs vom Koordinator abholen und rechnen")
+    worker.add_argument('--host', default='127.0.0.1')
+    worker.add_argument('--port', type=int, default=DEFAULT_PORT)
+    worker.add_argument('--max-jobs', type=int, help="Nach so vielen Jobs beenden")
+    args = parser.parse_args(argv)
+
+    if args.mode == 'worker':
+        connection = SocketConnection(args.host, args.port)
+        try:
+            run_worker(connection, max_jobs=args.max_jobs)
+        finally:
+            connection.close()
+        return 0
+
+    spec = load_spec(args.spec)
+    output_path = args.output or spec.get('output') or f"{spec.get('name', 'experiment')}.jsonl"
+    with Coordinator(expand_jobs(spec), output_path, args.host, args.port, args.lease) as server:
+        print(f"Koordinator lauscht auf {server.address[0]}:{server.address[1]}")
+        server.wait()
+        # Kurz weiterlaufen, damit wartende Worker noch 'done' erhalten
+        time.sleep(1.5)
+        failed = sum(1 for row in server.queue.results.values() if row['status'] != 'ok')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+
+from OutputData import TourSolution
+from SolutionPool import bitset_similarity, node_bitset, pool_key
+
+ARCHIVE_VERSION = 1
+
+
+def instance_hash(input_data):
+    """
+    Fingerabdruck des Instanzinhalts (Zeitlimit und Knoten mit Koordinaten und Scores), unabhängig von Dateiname,
+    Instanzname und Formatierung der Datei. Gleicher Hash = gleiche Instanz, archivierte Touren bleiben gültig.
+    """
+    content = [input_data.time_limit, [[node.id, node.x, node.y, node.score] for node in input_data.nodes]]
+    return hashlib.sha1(json.dumps(content).encode('utf-8')).hexdigest()[:16]
+
+
+class EliteArchive:
+    """
+    Persistentes Archiv der besten, untereinander diversen Lösungen pro Instanz über viele Läufe hinweg
+    (eine JSON-Datei pro Instanz in `directory`, benannt nach instance_hash).
+    Die VNS kann daraus ihren Pool und ihre Startlösung füllen (Parameter 'elite_archive') und schreibt am Ende ihre
+    eigenen Pool-Lösungen zurück, so baut jeder Seed/Parameterlauf auf den bisher besten Touren auf statt auf der Greedy-Startlösung.
+
+    Verdrängung deterministisch: Alle Kandidaten (Archiv + neue Lösungen) werden nach `pool_key` sortiert (Score, Distanz,
+    Tour) und von der besten an übernommen, sofern sie keiner schon übernommenen Lösung ähnlicher als `similarity_threshold`
+    sind, bis `max_size` erreicht ist. Das Ergebnis hängt also nur von der Menge der Kandidaten ab, nicht von ihrer Reihenfolge.
+
+    Schreiben erfolgt atomar (temporäre Datei + Umbenennen). Bei parallelen Läufen auf derselben Instanz gewinnt das letzte
+    Schreiben, gefundene Lösungen eines gleichzeitig laufenden Prozesses können also fehlen, kaputt geht die Datei nicht.
+    """
+    def __init__(self, directory, max_size=20, similarity_threshold=0.85):
+        self.directory = directory
+        self.max_size = max_size
+        self.similarity_threshold = similarity_threshold
+
+    def path_for(self, input_data):
+        return os.path.join(self.directory, f"{instance_hash(input_data)}.json")
+
+    def _read_tours(self, input_data):
+        path = self.path_for(input_data)
+        if not os.path.exists(path): return []
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                state = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return []
+        if state.get('version') != ARCHIVE_VERSION: return []
+        return state.get('tours', [])
+
+    def load(self, input_data):
+        """Archivierte Lösungen der Instanz (neu bewertet, nur gültige), beste zuerst / leer ohne Archivdatei."""
+        solutions = []
+        for tour in self._read_tours(input_data):
+            solution = TourSolution(tour, input_data.time_limit)
+            solution.evaluate(input_data)
+            if solution.is_valid:
+                solutions.append(solution)
+        solutions.sort(key=pool_key, reverse=True)
+        return solutions
+
+    def select(self, solutions):
+        """Auswahl der zu behaltenden Lösungen (beste zuerst, diverse, höchstens max_size), siehe Klassenbeschreibung."""
+        kept, masks, seen = [], [], set()
+        for solution in sorted(solutions, key=pool_key, reverse=True):
+            if len(kept) >= self.max_size: break
+            tour = tuple(solution.tour)
+            if tour in seen or not solution.is_valid: continue
+            mask = node_bitset(solution.tour)
+            if any(bitset_similarity(other, mask) > self.similarity_threshold for other in masks): continue
+            seen.add(tour)
+            kept.append(solution)
+            masks.append(mask)
+        return kept
+
+    def update(self, input_data, solutions):
+        """Führt neue Lösungen mit dem Archiv zusammen und schreibt es. Rückgabe: die behaltenen Lösungen, beste zuerst."""
+        kept = self.select(self.load(input_data) + list(solutions))
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(input_data)
+        state = {
+            'version': ARCHIVE_VERSION,
+            'instance': input_data.name,
+            'hash': instance_hash(input_data),
+            'node_count': input_data.node_count,
+            'tours': [list(solution.tour) for solution in kept],
+            'scores': [solution.score for solution in kept],
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(state, file)
+        os.replace(tmp_path, path)
+        return kept
@@ -0,0 +1,98 @@
+import sys
+from OutputData import TourSolution
+from Bounds import fractional_knapsack
+
+
+def solve_exact(input_data, incumbent=None, deadline=None):
+    """
+    Exakter Branch-and-Bound für kleine OP-Instanzen.
+    Die Tour wird als Pfad ab dem Depot aufgebaut (Tiefensuche). Jeder Zwischenstand ist mit der Rückfahrt zum Depot eine gültige Tour.
+
+    Schranke (score-basiert): aktueller Score + fraktionaler Rucksack über alle noch erreichbaren Knoten.
+    Gewicht eines Knotens ist die Hälfte seiner zwei kürzesten Kanten zu den noch möglichen Knoten (inkl. aktuellem Knoten und Depot),
+    denn jeder besuchte Knoten hat im Rest-Pfad genau zwei Kanten. Kapazität ist die Restdistanz.
+    Dominanz: wurde dieselbe Knotenmenge mit demselben letzten Knoten schon mit kürzerer Distanz erreicht, wird abgeschnitten.
+
+    incumbent: optionale Startlösung (z. B. aus select_best_start_solution) als untere Schranke
+    deadline: optionales Deadline-Objekt / bei Ablauf wird die bis dahin beste Lösung ohne Optimalitätsbeweis zurückgegeben
+
+    Rückgabe:
+        (beste_Lösung, bewiesen_optimal)
+    """
+    n = input_data.node_count
+    dist = input_data.distance_matrix
+    time_limit = input_data.time_limit
+    scores = [node.score for node in input_data.nodes]
+    depot_row = dist[0]
+
+    best_score = incumbent.score if incumbent is not None and incumbent.is_valid else 0
+    best_path = None
+    seen = {}       # (Knotenmenge als Bitmaske, letzter Knoten) -> kürzeste bekannte Distanz
+    path = [0]      # Indizes (Node-ID - 1) des aktuellen Pfads
+    aborted = False
+
+    def bound(u, remaining, candidates):
+        """Obere Schranke für den zusätzlich erreichbaren Score (fraktionaler Rucksack)."""
+        if not candidates: return 0.0
+        ends = candidates + [u, 0]
+        items = []
+        for k in candidates:
+            row = dist[k]
+            first = second = float('inf')
+            for j in ends:
+                if j == k: continue
+                d = row[j]
+                if d < first:
+                    second = first
+                    first = d
+                elif d < second:
+                    second = d
+            items.append(((first + second) / 2, scores[k]))
+        # Die beiden Pfadenden (aktueller Knoten und Depot) haben nur je eine Kante in den Rest-Pfad
+        row_u = dist[u]
+        capacity = remaining - (min(row_u[j] for j in candidates) + min(depot_row[j] for j in candidates)) / 2
+        return fractional_knapsack(items, capacity)
+
+    def search(u, used, score, mask, parent_candidates):
+        nonlocal best_score, best_path, aborted
+        if aborted: return
+        if deadline is not None and deadline.poll():
+            aborted = True
+            return
+
+        key = (mask, u)
+        known = seen.get(key)
+        if known is not None and known <= used: return
+        seen[key] = used
+
+        if score > best_score:
+            best_score = score
+            best_path = list(path)
+
+        remaining = time_limit - used
+        row_u = dist[u]
+        # Nur Knoten, die von hier aus noch mit Rückfahrt ins Budget passen
+        candidates = [k for k in parent_candidates if k != u and row_u[k] + depot_row[k] <= remaining]
+        # Scores sind ganzzahlig, deshalb darf die Schranke abgerundet werden
+        if score + int(bound(u, remaining, candidates) + 1e-9) <= best_score: return
+
+        # Vielversprechende Knoten (Score pro Distanz) zuerst / findet früh gute Lösungen und beschleunigt das Abschneiden
+        candidates.sort(key=lambda k: -scores[k] / (row_u[k] + 1e-9))
+        for k in candidates:
+            path.append(k)
+            search(k, used + row_u[k], score + scores[k], mask | (1 << k), candidates)
+            path.pop()
+
+    old_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(old_limit, n + 100))
+    try:
+        search(0, 0.0, 0, 1, list(range(1, n)))
+    finally:
+        sys.setrecursionlimit(old_limit)
+
+    if best_path is None:
+        solution = incumbent if incumbent is not None else TourSolution([1, 1], time_limit)
+    else:
+        solution = TourSolution([input_data.nodes[i].id for i in best_path] + [1], time_limit)
+    solution.evaluate(input_data)
+    return solution, not aborted
@@ -0,0 +1,180 @@
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from InputData import load_instance
+from ResultsSink import ResultsSink, read_rows, result_row
+from StartSolutionSelector import select_best_start_solution
+from VNS import DEFAULT_PARAMS, run_vns_parametrized
+
+
+def load_spec(path):
+    """Liest eine Experiment-Spezifikation (JSON, siehe expand_jobs)."""
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+# Inhalts-Hashes der Instanzdateien: Pfad -> (Änderungszeit, Hash) / große Gitter lesen jede Datei nur einmal
+_content_hashes = {}
+
+
+def instance_key(instance_path):
+    """
+    Kennung einer Instanzdatei für job_id: Hash des Dateiinhalts.
+    Gleichnamige Dateien in verschiedenen Ordnern (z. B. generierte Sets) bekommen so verschiedene IDs,
+    dieselbe Datei unter einem anderen Pfad (anderer Rechner, anderes Arbeitsverzeichnis) dieselbe.
+    Fehlt die Datei, zählt der normalisierte Pfad (der Job scheitert dann ohnehin beim Laden).
+    """
+    try:
+        mtime = os.path.getmtime(instance_path)
+    except OSError:
+        return os.path.normpath(os.path.abspath(instance_path))
+    cached = _content_hashes.get(instance_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(instance_path, 'rb') as file:
+        digest = hashlib.sha1(file.read()).hexdigest()
+    _content_hashes[instance_path] = (mtime, digest)
+    return digest
+
+
+def job_id(instance_path, seed, params):
+    """Eindeutige, stabile ID eines Jobs (Instanzinhalt, Seed, Parameter) / Grundlage für das Fortsetzen."""
+    key = json.dumps([instance_key(instance_path), seed, params], sort_keys=True, default=str)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def make_job(experiment, instance_path, seed, params, grid_point=None):
+    """Ein Job (Dict) für run_job / run_jobs."""
+    return {
+        'job_id': job_id(instance_path, seed, params),
+        'experiment': experiment,
+        'instance_path': instance_path,
+        'seed': seed,
+        'params': params,
+        'grid_point': grid_point or {},
+    }
+
+
+def expand_jobs(spec):
+    """
+    Erzeugt alle Jobs einer Experiment-Spezifikation: Instanzen x Seeds x Parameter-Gitter.
+
+    spec:
+        name: Name des Experiments (landet in jeder Ergebniszeile)
+        instances: Liste von Instanzdateien
+        seeds: Liste von Seeds (Standard: [1])
+        params: feste Parameter (fehlende Werte aus DEFAULT_PARAMS)
+        grid: Dict Parameter -> Liste von Werten / alle Kombinationen werden durchlaufen (kartesisches Produkt)
+    Reihenfolge: Gitterpunkt, Instanz, Seed / so sind die ersten Ergebnisse schon über alle Instanzen verteilt.
+    """
+    base_params = dict(DEFAULT_PARAMS)
+    base_params.update(spec.get('params', {}))
+    grid = spec.get('grid', {})
+    names = sorted(grid)
+    jobs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(base_params)
+        params.update(zip(names, values))
+        for instance_path in spec['instances']:
+            for seed in spec.get('seeds', [1]):
+                jobs.append(make_job(spec.get('name', 'experiment'), instance_path, seed, params, dict(zip(names, values))))
+    return jobs
+
+
+def print_row(row, finished, total):
+    result = f"Score={row['score']}" if row['status'] == 'ok' else row['error']
+    print(f"[{finished}/{total}] {os.path.basename(row['instance_path'])} Seed {row['seed']} "
+          f"{row['grid_point']}: {result} ({row['elapsed']:.1f} s)")
+
+
+def run_job(job):
+    """
+    Führt einen Job aus (im Worker-Prozess): Instanz laden (Cache pro Prozess), Startlösung, run_vns_parametrized.
+    Gibt eine Ergebniszeile (Dict) zurück, Fehler werden als Zeile mit status 'error' gemeldet statt den Lauf abzubrechen.
+    'elapsed' ist Wandzeit, 'cpu_seconds' die CPU-Zeit des Worker-Prozesses für diesen Job.
+    """
+    row = {key: job[key] for key in ('job_id', 'experiment', 'instance_path', 'seed', 'grid_point', 'params')}
+    started = time.time()
+    cpu_started = time.process_time()
+    try:
+        data = load_instance(job['instance_path'])
+        rnd = random.Random(job['seed'])
+        start_solution, method = select_best_start_solution(data, rnd=rnd)
+        run_info = {}
+        best = run_vns_parametrized(data, start_solution, rnd, dict(job['params']), started, verbose=False, run_info=run_info)
+        row.update(result_row(data, start_solution, method, best, time.time() - started, job['seed'], job['params'], run_info),
+                   status='ok')
+    except Exception as e:
+        row.update({'status': 'error', 'error': f"{type(e).__name__}: {e}", 'elapsed': time.time() - started,
+                    'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S')})
+    row['cpu_seconds'] = time.process_time() - cpu_started
+    return row
+
+
+def run_jobs(jobs, output_path, max_workers=None, verbose=True):
+    """
+    Führt alle Jobs aus, die noch nicht erfolgreich in `output_path` stehen, parallel in einem Prozesspool.
+    Jede fertige Zeile wird sofort als JSON-Zeile an `output_path` angehängt (ResultsSink), ein abgebrochener Lauf wird durch erneuten Aufruf fortgesetzt.
+    max_workers=1 rechnet ohne Pool im eigenen Prozess (z. B. zum Debuggen).
+    Rückgabe: job_id -> Ergebniszeile für alle übergebenen Jobs (auch die schon vorhandenen)
+    """
+    results = {row['job_id']: row for row in read_rows(output_path) if row.get('status') == 'ok'}
+    pending = [job for job in jobs if job['job_id'] not in results]
+    if verbose:
+        print(f"{len(jobs)} Jobs, {len(jobs) - len(pending)} schon erledigt, {len(pending)} offen -> {output_path}")
+
+    finished = 0
+    with ResultsSink(output_path) as sink:
+        def write(row):
+            nonlocal finished
+            sink.write(row)
+            results[row['job_id']] = row
+            finished += 1
+            if verbose:
+                print_row(row, finished, len(pending))
+
+        if max_workers == 1 or not pending:
+            for job in pending:
+                write(run_job(job))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as pool:
+                futures = [pool.submit(run_job, job) for job in pending]
+                for future in as_completed(futures):
+                    write(future.result())
+    return {job['job_id']: results[job['job_id']] for job in jobs if job['job_id'] in results}
+
+
+def run_experiment(spec, output_path=None, max_workers=None, verbose=True):
+    """
+    Führt alle noch offenen Jobs einer Spezifikation aus (siehe expand_jobs und run_jobs).
+    output_path: Ergebnisdatei (JSON Lines), Standard: spec['output'] bzw. <name>.jsonl
+    Rückgabe: Liste der Ergebniszeilen in der Reihenfolge der Jobs
+    """
+    output_path = output_path or spec.get('output') or f"{spec.get('name', 'experiment')}.jsonl"
+    if verbose:
+        print(f"Experiment '{spec.get('name', 'experiment')}':", end=' ')
+    jobs = expand_jobs(spec)
+    results = run_jobs(jobs, output_path, max_workers, verbose)
+    return [results[job['job_id']] for job in jobs if job['job_id'] in results]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Führt ein Experiment (Instanzen x Seeds x Parameter-Gitter) parallel aus.")
+    parser.add_argument('spec', help="Experiment-Spezifikation (JSON)")
+    parser.add_argument('--output', help="Ergebnisdatei (JSON Lines), Standard: 'output' aus der Spezifikation")
+    parser.add_argument('--workers', type=int, help="Anzahl Prozesse (Standard: alle Kerne)")
+    args = parser.parse_args(argv)
+    spec = load_spec(args.spec)
+    rows = run_experiment(spec, args.output, args.workers)
+    return 0 if len(rows) == len(expand_jobs(spec)) and all(row['status'] == 'ok' for row in rows) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
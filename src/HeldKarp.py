@@ -0,0 +1,97 @@
+from itertools import combinations
+
+
+class HeldKarpSequencer:
+    """
+    Exakte Reihenfolge (TSP) für die Knoten einer kurzen Tour per Held-Karp Bitmasken-DP.
+
+    Tabelle: (Bitmaske der besuchten Knoten-IDs, letzter Knoten) -> (kürzeste Pfadlänge ab Depot, Vorgänger).
+    Der Wert eines Eintrags hängt nur von der Knotenmenge und dem letzten Knoten ab, nicht von der restlichen Tour.
+    Deshalb bleibt die Tabelle über alle Aufrufe erhalten: ändert sich die Knotenmenge nur um einen Knoten,
+    sind alle Teilmengen ohne diesen Knoten schon berechnet und werden direkt wiederverwendet.
+    Teilpfade, die selbst mit direkter Rückfahrt das TimeLimit sprengen, werden als unzulässig markiert und nicht weiter verfolgt.
+    """
+    def __init__(self, input_data, max_nodes=12, max_memo_entries=1000000, deadline=None):
+        self.input_data = input_data
+        self.max_nodes = max_nodes
+        self.max_memo_entries = max_memo_entries
+        self.deadline = deadline
+        self._memo = {}      # (Bitmaske, letzter Knoten) -> (Länge, Vorgänger)
+        self._results = {}   # Bitmaske der Knotenmenge -> optimale Tour (oder None, wenn unzulässig)
+        self.reused_entries = 0
+
+    def clear(self):
+        """Leert Tabelle und Ergebnisse (z. B. damit ein Benchmark jeden Aufruf mit voller DP misst)."""
+        self._memo.clear()
+        self._results.clear()
+
+    def optimal_tour(self, node_ids):
+        """
+        Gibt die kürzeste gültige Tour [1, ..., 1] über genau diese Knoten zurück.
+        None, wenn es zu viele Knoten sind, keine Reihenfolge ins TimeLimit passt oder die Deadline abläuft.
+        """
+        nodes = sorted(node_ids)
+        if not nodes or len(nodes) > self.max_nodes: return None
+
+        full_mask = 0
+        for node_id in nodes:
+            full_mask |= 1 << node_id
+        if full_mask in self._results:
+            return self._results[full_mask]
+
+        # Einfache Begrenzung des Speichers / deterministisch, da komplett geleert wird
+        if len(self._memo) > self.max_memo_entries:
+            self.clear()
+
+        dist = self.input_data.distance_matrix
+        time_limit = self.input_data.time_limit
+        memo = self._memo
+        infinity = float('inf')
+
+        for size in range(1, len(nodes) + 1):
+            for subset in combinations(nodes, size):
+                if self.deadline is not None and self.deadline.poll():
+                    return None
+                mask = 0
+                for node_id in subset:
+                    mask |= 1 << node_id
+                for last in subset:
+                    key = (mask, last)
+                    if key in memo:
+                        self.reused_entries += 1
+                        continue
+                    row_last = dist[last - 1]
+                    if size == 1:
+                        best_length, best_prev = dist[0][last - 1], 1
+                    else:
+                        rest = mask ^ (1 << last)
+                        best_length, best_prev = infinity, None
+                        for prev in subset:
+                            if prev == last: continue
+                            length = memo[(rest, prev)][0] + row_last[prev - 1]
+                            if length < best_length:
+                                best_length, best_prev = length, prev
+                    # Schon ohne weitere Knoten nicht mehr zurück zum Depot im Limit -> unzulässig
+                    if best_length + row_last[0] > time_limit:
+                        best_length, best_prev = infinity, None
+                    memo[key] = (best_length, best_prev)
+
+        best_total, best_last = infinity, None
+        for last in nodes:
+            total = memo[(full_mask, last)][0] + dist[last - 1][0]
+            if total < best_total:
+                best_total, best_last = total, last
+
+        tour = None
+        if best_last is not None:
+            # Rückwärts über die Vorgänger die Reihenfolge rekonstruieren
+            order = []
+            mask, last = full_mask, best_last
+            while last != 1:
+                order.append(last)
+                prev = memo[(mask, last)][1]
+                mask ^= 1 << last
+                last = prev
+            tour = [1] + order[::-1] + [1]
+        self._results[full_mask] = tour
+        return tour
@@ -1,5 +1,6 @@
 import json
 import math
+import os
 
 
 # Klasse für einen Knoten im Graphen
@@ -67,6 +68,22 @@ class InputData:
         return self.distance_matrix[node_id_1 - 1][node_id_2 - 1]  # Achtung: Node-IDs starten bei 1
 
 
+# Bereits geladene Instanzen pro Prozess: Pfad -> (Änderungszeit der Datei, InputData)
+# Viele Läufe auf derselben Instanz (Service, Experimente, Worker) zahlen das Einlesen und die Distanzmatrix so nur einmal.
+_instance_cache = {}
+
+
+def load_instance(path):
+    """Lädt eine Instanz oder nimmt sie aus dem Cache, solange sich die Datei nicht geändert hat."""
+    mtime = os.path.getmtime(path)
+    cached = _instance_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    data = InputData(path)
+    _instance_cache[path] = (mtime, data)
+    return data
+
+
 # Beispielnutzung / Test
 # if __name__ == '__main__':
 #   data = InputData("Instanzen/Instance_1.json")
@@ -0,0 +1,149 @@
+import argparse
+import json
+import math
+import os
+import random
+
+DISTRIBUTIONS = ("uniform", "clustered", "ring")
+SCORE_DISTRIBUTIONS = ("uniform", "constant", "distance", "skewed")
+
+
+def _uniform_points(rnd, count, size):
+    return [(rnd.uniform(0, size), rnd.uniform(0, size)) for _ in range(count)]
+
+
+def _clustered_points(rnd, count, size, clusters):
+    """Normalverteilte Punktwolken um zufällige Zentren (Streuung ~ size/20), am Rand des Gebiets abgeschnitten."""
+    centers = [(rnd.uniform(0.1 * size, 0.9 * size), rnd.uniform(0.1 * size, 0.9 * size)) for _ in range(clusters)]
+    sigma = size / 20
+    points = []
+    for _ in range(count):
+        cx, cy = centers[rnd.randrange(clusters)]
+        points.append((min(size, max(0.0, rnd.gauss(cx, sigma))), min(size, max(0.0, rnd.gauss(cy, sigma)))))
+    return points
+
+
+def _ring_points(rnd, count, size):
+    """Punkte auf einem Ring um die Mitte (Radius 40 % der Kantenlänge, +-5 % Streuung) / Depot in der Mitte erzwingt lange Anfahrten."""
+    center, radius = size / 2, 0.4 * size
+    points = []
+    for _ in range(count):
+        angle = rnd.uniform(0, 2 * math.pi)
+        r = radius * (1 + rnd.uniform(-0.05, 0.05))
+        points.append((center + r * math.cos(angle), center + r * math.sin(angle)))
+    return points
+
+
+def _scores(rnd, points, depot, score_distribution, max_score):
+    if score_distribution == "constant":
+        return [1 for _ in points]
+    if score_distribution == "uniform":
+        return [rnd.randint(1, max_score) for _ in points]
+    if score_distribution == "distance":
+        # Weit entfernte Knoten sind mehr wert (wie Generation 3 bei Tsiligirides / Fischetti et al.)
+        distances = [math.hypot(x - depot[0], y - depot[1]) for x, y in points]
+        farthest = max(distances) or 1.0
+        return [1 + int((max_score - 1) * d / farthest) for d in distances]
+    if score_distribution == "skewed":
+        # Wenige sehr wertvolle Knoten, viele kleine (Pareto-verteilt, gekappt bei max_score)
+        return [min(max_score, int(rnd.paretovariate(1.5))) for _ in points]
+    raise ValueError(f"Unbekannte Score-Verteilung '{score_distribution}' (erlaubt: {', '.join(SCORE_DISTRIBUTIONS)})")
+
+
+def estimate_tour_length(points, size):
+    """
+    Schätzung der Länge einer Rundtour durch alle Punkte (Beardwood-Halton-Hammersley: ~0.7124 * sqrt(n * Fläche)).
+    Reicht für die Wahl des TimeLimits und ist auch für zehntausende Knoten sofort berechnet.
+    """
+    return 0.7124 * math.sqrt(len(points) * size * size)
+
+
+def generate_instance(node_count, distribution="uniform", score_distribution="uniform", tightness=0.3, seed=0,
+                      size=4000, clusters=None, max_score=100, depot="center", name=None):
+    """
+    Erzeugt eine synthetische OP-Instanz im selben JSON-Schema wie die Dateien in Instanzen/ (Name, DistanceMetric, TimeLimit, NodeCount, Nodes).
+
+    node_count: Anzahl Knoten inkl. Depot (Id 1, Score 0)
+    distribution: 'uniform', 'clustered' oder 'ring'
+    score_distribution: 'uniform' (1..max_score), 'constant' (alle 1), 'distance' (steigt mit Abstand zum Depot), 'skewed' (Pareto)
+    tightness: TimeLimit als Anteil der geschätzten Tourlänge durch alle Knoten (klein = nur wenige Knoten erreichbar)
+    clusters: Anzahl Cluster bei 'clustered' (Standard: ~sqrt(n)/3, mindestens 3)
+    depot: 'center' oder 'random'
+    Deterministisch pro Seed: Koordinaten werden auf ganze Zahlen gerundet, dadurch ist die Datei auf allen Rechnern identisch.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unbekannte Verteilung '{distribution}' (erlaubt: {', '.join(DISTRIBUTIONS)})")
+    if node_count < 2:
+        raise ValueError("Eine Instanz braucht mindestens das Depot und einen Knoten.")
+    rnd = random.Random(seed)
+    count = node_count - 1
+
+    if distribution == "uniform":
+        points = _uniform_points(rnd, count, size)
+    elif distribution == "clustered":
+        points = _clustered_points(rnd, count, size, clusters or max(3, round(math.sqrt(node_count) / 3)))
+    else:
+        points = _ring_points(rnd, count, size)
+    points = [(float(round(x)), float(round(y))) for x, y in points]
+
+    depot_point = (float(round(size / 2)), float(round(size / 2))) if depot == "center" else \
+        (float(round(rnd.uniform(0, size))), float(round(rnd.uniform(0, size))))
+    scores = _scores(rnd, points, depot_point, score_distribution, max_score)
+
+    nodes = [{"Id": 1, "X": depot_point[0], "Y": depot_point[1], "Score": 0}]
+    for i, ((x, y), score) in enumerate(zip(points, scores), start=2):
+        nodes.append({"Id": i, "X": x, "Y": y, "Score": score})
+
+    time_limit = max(1, int(tightness * estimate_tour_length(points + [depot_point], size)))
+    if name is None:
+        name = f"Synthetic_{distribution}_{score_distribution}_{node_count}_s{seed}"
+    return {
+        "Name": name,
+        "DistanceMetric": "EDGE_WEIGHT_EUC_2D",
+        "TimeLimit": time_limit,
+        "NodeCount": node_count,
+        "Nodes": nodes,
+    }
+
+
+def write_instance(instance, path):
+    """Schreibt eine Instanz im Format der mitgelieferten Dateien (JSON, 4 Leerzeichen Einrückung)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(instance, file, indent=4)
+
+
+def generate_scaling_set(directory, sizes=(250, 500, 1000, 2000), distributions=DISTRIBUTIONS, seed=0, **options):
+    """Schreibt eine Instanz pro (Größe, Verteilung) in `directory` und gibt die Pfade zurück (vorhandene Dateien werden überschrieben)."""
+    paths = []
+    for size in sizes:
+        for distribution in distributions:
+            instance = generate_instance(size, distribution=distribution, seed=seed, **options)
+            path = os.path.join(directory, f"{instance['Name']}.json")
+            write_instance(instance, path)
+            paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Erzeugt synthetische OP-Instanzen im Format von Instanzen/*.json.")
+    parser.add_argument('--nodes', type=int, nargs='+', default=[1000], help="Knotenanzahl(en) inkl. Depot")
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, nargs='+', default=["uniform"])
+    parser.add_argument('--scores', choices=SCORE_DISTRIBUTIONS, default="uniform")
+    parser.add_argument('--tightness', type=float, default=0.3, help="TimeLimit als Anteil der geschätzten Tourlänge durch alle Knoten")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--size', type=float, default=4000, help="Kantenlänge des quadratischen Gebiets")
+    parser.add_argument('--clusters', type=int, help="Anzahl Cluster bei 'clustered'")
+    parser.add_argument('--depot', choices=("center", "random"), default="center")
+    parser.add_argument('--output-dir', default="Instanzen/synthetic")
+    args = parser.parse_args(argv)
+
+    for path in generate_scaling_set(args.output_dir, args.nodes, args.distribution, args.seed, score_distribution=args.scores,
+                                     tightness=args.tightness, size=args.size, clusters=args.clusters, depot=args.depot):
+        print(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+from collections import OrderedDict
+
+from OutputData import TourSolution
+
+
+class LocalOptimaRegistry:
+    """
+    Gedächtnis der VND für bereits besuchte Touren.
+    Jede local search Methode ist deterministisch: dieselbe Tour liefert immer dasselbe Ergebnis. Bei fester Reihenfolge der
+    Nachbarschaften führt dieselbe Tour also immer zum selben lokalen Optimum.
+    Deshalb wird für jede Tour (Fingerprint = Knotenreihenfolge) gespeichert,
+      1. zu welchem lokalen Optimum die VND von ihr aus geführt hat und
+      2. welche Nachbarschaften für sie schon als nicht verbessernd bewiesen sind.
+    Ändert sich die Reihenfolge im Lauf (adaptive VND, siehe AdaptiveSelection.py), kann dieselbe Tour je nach Reihenfolge
+    in einem anderen Optimum landen. Dann wird Tabelle 1 zusätzlich nach der Reihenfolge (`order`) geschlüsselt.
+    Tabelle 2 und "ein lokales Optimum führt zu sich selbst" gelten unabhängig von der Reihenfolge.
+    Beide Tabellen sind in der Größe begrenzt (LRU / die am längsten nicht genutzten Einträge fliegen zuerst raus),
+    damit der Speicher bei langen Läufen nicht unbegrenzt wächst. Die Verdrängung ist deterministisch.
+    """
+    def __init__(self, max_size=5000):
+        self.max_size = max_size
+        self._optima = OrderedDict()          # Fingerprint -> lokales Optimum (TourSolution)
+        self._non_improving = OrderedDict()   # Fingerprint -> Menge der Methoden-Namen ohne Verbesserung
+        self.hits = 0                         # Wie oft eine komplette VND übersprungen wurde
+        self.skipped_scans = 0                # Wie oft eine einzelne Nachbarschaft übersprungen wurde
+
+    @staticmethod
+    def fingerprint(tour):
+        """Die Tour als hashbares Tupel. Knotenmenge und Reihenfolge fließen beide ein."""
+        return tuple(tour)
+
+    def _touch(self, table, key, value):
+        """Setzt einen Eintrag, markiert ihn als zuletzt benutzt und verdrängt ggf. den ältesten."""
+        table[key] = value
+        table.move_to_end(key)
+        if len(table) > self.max_size:
+            table.popitem(last=False)
+
+    def _start_key(self, tour, order):
+        key = self.fingerprint(tour)
+        return key if order is None else (key, tuple(order))
+
+    def lookup(self, tour, order=None):
+        """
+        Gibt das bekannte lokale Optimum zu dieser Tour zurück oder None.
+        order: Reihenfolge der Nachbarschaften dieser VND, falls sie sich im Lauf ändert / None = feste Reihenfolge
+        """
+        key = self._start_key(tour, order)
+        local_optimum = self._optima.get(key)
+        if local_optimum is None and order is not None:
+            # Ist die Tour selbst ein lokales Optimum, gilt das für jede Reihenfolge
+            key = self.fingerprint(tour)
+            local_optimum = self._optima.get(key)
+        if local_optimum is not None:
+            self._optima.move_to_end(key)
+            self.hits += 1
+        return local_optimum
+
+    def record(self, start_tour, local_optimum, method_names, order=None):
+        """
+        Speichert das Ergebnis einer vollständig durchlaufenen VND (order wie bei lookup).
+        Das lokale Optimum selbst ist für alle Nachbarschaften (method_names) nicht verbessernd.
+        """
+        self._touch(self._optima, self._start_key(start_tour, order), local_optimum)
+        self._touch(self._optima, self.fingerprint(local_optimum.tour), local_optimum)
+        self._touch(self._non_improving, self.fingerprint(local_optimum.tour), set(method_names))
+
+    def is_non_improving(self, tour, method_name):
+        """True, wenn die Nachbarschaft `method_name` für diese Tour schon ohne Verbesserung durchsucht wurde."""
+        checked = self._non_improving.get(self.fingerprint(tour))
+        if checked is not None and method_name in checked:
+            self.skipped_scans += 1
+            return True
+        return False
+
+    def mark_non_improving(self, tour, method_name):
+        """Merkt sich, dass `method_name` für diese Tour keine Verbesserung gebracht hat."""
+        key = self.fingerprint(tour)
+        checked = self._non_improving.get(key)
+        if checked is None:
+            self._touch(self._non_improving, key, {method_name})
+        else:
+            checked.add(method_name)
+            self._non_improving.move_to_end(key)
+
+    def get_state(self):
+        """
+        Beide Tabellen in LRU-Reihenfolge als reine Daten (für Checkpoints / Fortsetzen über resume_state).
+        Ohne sie startet ein fortgesetzter Lauf mit leerem Gedächtnis, führt VNDs aus, die sonst übersprungen würden,
+        und verbraucht ein Bewertungsbudget (max_evaluations) anders als der ununterbrochene Lauf.
+        Lokale Optima werden nur einmal als Tour gespeichert, die Einträge verweisen per Index darauf.
+        """
+        index_of, optima, entries = {}, [], []
+        for key, local_optimum in self._optima.items():
+            if id(local_optimum) not in index_of:
+                index_of[id(local_optimum)] = len(optima)
+                optima.append(list(local_optimum.tour))
+            entries.append((key, index_of[id(local_optimum)]))
+        return {
+            'optima': optima,
+            'entries': entries,
+            'non_improving': [(key, sorted(names)) for key, names in self._non_improving.items()],
+            'hits': self.hits,
+            'skipped_scans': self.skipped_scans,
+        }
+
+    def set_state(self, state, input_data):
+        """Stellt einen mit get_state gespeicherten Zustand wieder her (Touren werden neu bewertet)."""
+        optima = []
+        for tour in state['optima']:
+            solution = TourSolution(tour, input_data.time_limit)
+            solution.evaluate(input_data)
+            optima.append(solution)
+        self._optima = OrderedDict((key, optima[index]) for key, index in state['entries'])
+        self._non_improving = OrderedDict((key, set(names)) for key, names in state['non_improving'])
+        self.hits = state['hits']
+        self.skipped_scans = state['skipped_scans']
+
+    def __len__(self):
+        return len(self._optima)
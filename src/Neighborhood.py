@@ -1,12 +1,36 @@
 import random
+import time
 from OutputData import TourSolution
+from HeldKarp import HeldKarpSequencer
+
+# NumPy ist optional / nur für die gebündelte Bewertung (batched_evaluation) nötig, ohne NumPy laufen die normalen Schleifen.
+# Importiert wird erst beim ersten Generator mit batched_evaluation (_import_numpy), Läufe ohne starten so schneller.
+np = None
+_numpy_checked = False
+
+
+def _import_numpy():
+    """Importiert NumPy beim ersten Aufruf. Rückgabe: das Modul oder None, falls nicht installiert."""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            pass
+    return np
+
 
 class NeighborhoodGenerator:
     """
     Diese Klasse bündelt alle Operatoren zur Veränderung einer Tour.
     Sie enthält Methoden für Shaking und die local search sowie die Reparatur von Touren/Nach Starkem Shaking
     """
-    def __init__(self, input_data, seed=None, rnd = None, shaking_intensity_divisor=15, remove_var_min_pct=10, remove_var_max_pct=30):
+    # Namen der Shaking-Operatoren in random_modify (auch die Namen für die adaptive Auswahl, siehe AdaptiveSelection.py)
+    SHAKING_OPERATORS = ("remove", "shuffle", "remove_variable", "remove_worst", "swap_segments")
+
+    def __init__(self, input_data, seed=None, rnd = None, shaking_intensity_divisor=15, remove_var_min_pct=10, remove_var_max_pct=30, deadline=None, held_karp_max_nodes=0, batched_evaluation=False, shaking_selector=None, stats=None):
         self.input_data = input_data
         # gesetzter Seed aus dem Notebook oder wenn keiner vorhanden = random Seed
         self.random = rnd or random.Random(seed)
@@ -15,6 +39,33 @@ class NeighborhoodGenerator:
         self.shaking_intensity_divisor = shaking_intensity_divisor 
         self.remove_var_min_pct = remove_var_min_pct
         self.remove_var_max_pct = remove_var_max_pct 
+        # Optionales Zeitlimit (siehe Deadline.py) / Lange Operatoren brechen ab und geben ihre bisher beste Lösung zurück
+        self.deadline = deadline
+        # Exakte Neusortierung kurzer Touren (siehe held_karp_reorder) / 0 = aus
+        self.held_karp = HeldKarpSequencer(input_data, max_nodes=held_karp_max_nodes, deadline=deadline) if held_karp_max_nodes > 0 else None
+        # Gebündelte Bewertung der Einfüge-/Austausch-Nachbarschaften mit NumPy (siehe _best_batched_move)
+        self.batched_evaluation = batched_evaluation and _import_numpy() is not None
+        if self.batched_evaluation:
+            self._dist = np.array(input_data.distance_matrix, dtype=float)
+            self._scores = np.array([node.score for node in input_data.nodes])
+        # Anzahl bewerteter Nachbarn über den ganzen Lauf / Deterministisches Kostenmaß für die adaptive Operatorauswahl
+        self.evaluations = 0
+        # Optionale adaptive Auswahl der Shaking-Operatoren (AdaptiveOperatorSelector) / None = gleichverteilt wie bisher
+        self.shaking_selector = shaking_selector
+        # Optionale Statistik pro Operator (OperatorStats) / None = aus
+        self.stats = stats
+        # Zuletzt angewendete Shaking-Operatoren mit (Bewertungen, CPU-Sekunden), damit die VNS ihnen den Gewinn gutschreiben kann
+        self.last_shaking_ops = []
+
+    def _time_up(self):
+        """Kooperativer Abbruch: wird pro Nachbar-Bewertung aufgerufen (zählt dabei die Bewertungen) und ist ohne Deadline praktisch kostenlos."""
+        self.evaluations += 1
+        return self.deadline is not None and self.deadline.poll()
+
+    def _charge(self, count):
+        """Wie `_time_up`, aber für `count` gebündelt bewertete Nachbarn auf einmal (zählt auch bei einem Bewertungsbudget mit)."""
+        self.evaluations += count
+        return self.deadline is not None and self.deadline.charge(count)
 
     # SHAKING OPERATOREN 
     # Diese Methoden dienen dazu, eine Lösung stark zu verändern(zu shaken), um aus einem lokalen Optimum zu entkommen
@@ -119,6 +170,8 @@ class NeighborhoodGenerator:
                     tour = new_tour
                     added += 1
                     break
+                if self._time_up():
+                    return tour
             if max_add is not None and added >= max_add:
                 break
         return tour
@@ -137,16 +190,22 @@ class NeighborhoodGenerator:
 
         
         # Verwendete aggressive Operatoren 
-        ops = [
-            "remove", "shuffle", "remove_variable",
-            "remove_worst", "swap_segments" 
-        ]
+        ops = list(self.SHAKING_OPERATORS)
        
-
-        self.random.shuffle(ops)
-        chosen_ops = ops[:min(num_ops, len(ops))]
-
+        selector = self.shaking_selector
+        if selector is not None:
+            # Adaptive Auswahl: Roulette nach Gewinn pro Rechenaufwand (siehe AdaptiveSelection.py)
+            chosen_ops = selector.sample(num_ops)
+        else:
+            self.random.shuffle(ops)
+            chosen_ops = ops[:min(num_ops, len(ops))]
+
+        # Aufwand pro Operator nur messen, wenn ihn jemand braucht (adaptive Auswahl oder Statistik)
+        track = selector is not None or self.stats is not None
+        self.last_shaking_ops = []
         for op in chosen_ops:
+            if track:
+                start_evaluations, start_time = self.evaluations, time.process_time()
             if op == "remove":
                 tour = self.remove_k_random_nodes(tour, k=self.random.randint(1, 3))
             elif op == "shuffle":
@@ -160,6 +219,11 @@ class NeighborhoodGenerator:
                 tour = self.remove_worst_nodes(tour, k=self.random.randint(2, 4))
             elif op == "swap_segments": 
                 tour = self.swap_large_segments(tour)
+            if track:
+                evaluations, seconds = self.evaluations - start_evaluations, time.process_time() - start_time
+                self.last_shaking_ops.append((op, evaluations, seconds))
+                if self.stats is not None:
+                    self.stats.record('shaking', op, seconds, evaluations)
             
         # max 20 Knoten bei Repair / nicht mehr weil sonst dauert das zu lang (20 ist da schon ein ziemlich hoher wert der sich aber durch testen bewährt hat)
         if repair:
@@ -179,6 +243,7 @@ class NeighborhoodGenerator:
 
     def add_best_node(self, solution):
         """Sucht den besten Knoten der an der besten Position eingefügt werden kann."""
+        if self.batched_evaluation: return self._batched_insertion(solution)
         candidates = sorted([node.id for node in self.input_data.nodes if node.id not in solution.tour])
         best_solution = solution
         for node_id in candidates:
@@ -189,10 +254,13 @@ class NeighborhoodGenerator:
                 if neighbor.is_valid and (neighbor.score > best_solution.score or 
                    (neighbor.score == best_solution.score and neighbor.total_distance < best_solution.total_distance)):
                     best_solution = neighbor
+                if self._time_up():
+                    return best_solution
         return best_solution
 
     def replace_node(self, solution):
         """Sucht den besten Austausch eines Tour-Knotens gegen einen externen Knoten."""
+        if self.batched_evaluation: return self._batched_replacement(solution)
         candidates = sorted([node.id for node in self.input_data.nodes if node.id not in solution.tour])
         best_solution = solution
         for i in range(1, len(solution.tour) - 1):
@@ -203,6 +271,8 @@ class NeighborhoodGenerator:
                 if neighbor.is_valid and (neighbor.score > best_solution.score or 
                    (neighbor.score == best_solution.score and neighbor.total_distance < best_solution.total_distance)):
                     best_solution = neighbor
+                if self._time_up():
+                    return best_solution
         return best_solution
 
     def segment_move(self, solution):
@@ -221,10 +291,28 @@ class NeighborhoodGenerator:
                     if neighbor.is_valid and (neighbor.score > best_solution.score or 
                        (neighbor.score == best_solution.score and neighbor.total_distance < best_solution.total_distance)):
                         best_solution = neighbor
+                    if self._time_up():
+                        return best_solution
         return best_solution
 
+    def held_karp_reorder(self, solution):
+        """
+        Berechnet für kurze Touren (höchstens `held_karp_max_nodes` Kunden) die optimale Reihenfolge derselben Knoten (Held-Karp).
+        Die Knotenmenge bleibt gleich, nur die Distanz sinkt. Die frei werdende Zeit nutzen danach die Einfüge-Operatoren der VND.
+        """
+        if self.held_karp is None: return solution
+        tour = self.held_karp.optimal_tour(solution.tour[1:-1])
+        if tour is None or tour == solution.tour: return solution
+        neighbor = TourSolution(tour, self.input_data.time_limit)
+        neighbor.evaluate(self.input_data)
+        # Kleine Toleranz, damit Rundungsunterschiede bei gleich langen Reihenfolgen keine Schleife in der VND erzeugen
+        if neighbor.is_valid and neighbor.total_distance < solution.total_distance - 1e-9:
+            return neighbor
+        return solution
+
     def insert_best_node_at_best_position(self, solution):
         """Dopplung von `add_best_node`, aber mit anderer Kandidatensortierung. Dient der Diversität in der VND."""
+        if self.batched_evaluation: return self._batched_insertion(solution)
         best_solution = solution
         candidates = sorted([n for n in self.input_data.nodes if n.id not in solution.tour], key=lambda n: n.id)
         for node in candidates:
@@ -235,8 +323,79 @@ class NeighborhoodGenerator:
                 if neighbor.is_valid and (neighbor.score > best_solution.score or 
                    (neighbor.score == best_solution.score and neighbor.total_distance < best_solution.total_distance)):
                     best_solution = neighbor
+                if self._time_up():
+                    return best_solution
         return best_solution
 
+    # === GEBÜNDELTE BEWERTUNG (NumPy) ===
+    # Statt jeden Nachbarn als TourSolution zu bauen und komplett neu zu bewerten, wird die Distanzänderung
+    # aller (Kandidat, Position)-Paare auf einmal als Matrix berechnet. Ergebnis ist exakt derselbe Zug wie in den Schleifen.
+
+    def _unvisited_indices(self, tour_idx):
+        """Indizes (Node-ID - 1) aller Knoten, die nicht in der Tour sind / aufsteigend wie die sortierten Kandidaten der Schleifen."""
+        in_tour = np.zeros(self.input_data.node_count, dtype=bool)
+        in_tour[tour_idx] = True
+        return np.flatnonzero(~in_tour)
+
+    def _best_batched_move(self, solution, scores, deltas):
+        """
+        Reduziert die Score- und Distanzänderungsmatrix auf den besten Zug.
+        Maske: die Distanzänderung muss in den Schlupf (TimeLimit - Distanz) passen und der Zug muss die Lösung verbessern.
+        Auswahl: höchster Score, dann kürzeste Distanz, bei Gleichstand der erste Zug in der Reihenfolge der Schleifen (argmin auf der Zeilen-Matrix).
+        Rückgabe: (Zeile, Spalte) oder None
+        """
+        slack = self.input_data.time_limit - solution.total_distance
+        improving = (deltas <= slack) & ((scores > solution.score) | ((scores == solution.score) & (deltas < 0)))
+        if not improving.any(): return None
+        best_score = scores[improving].max()
+        flat = np.where(improving & (scores == best_score), deltas, np.inf).argmin()
+        return np.unravel_index(flat, deltas.shape)
+
+    def _accept_batched(self, solution, new_tour):
+        """Bewertet den gewählten Zug regulär nach / Schützt vor Rundungsunterschieden direkt an der Zeitgrenze."""
+        neighbor = TourSolution(new_tour, self.input_data.time_limit)
+        neighbor.evaluate(self.input_data)
+        if neighbor.is_valid and (neighbor.score > solution.score or
+           (neighbor.score == solution.score and neighbor.total_distance < solution.total_distance)):
+            return neighbor
+        return solution
+
+    def _batched_insertion(self, solution):
+        """Gebündelte Variante von `add_best_node` / `insert_best_node_at_best_position`: Matrix Kandidaten x Einfügepositionen."""
+        tour_idx = np.array(solution.tour) - 1
+        candidates = self._unvisited_indices(tour_idx)
+        if len(candidates) == 0: return solution
+        dist = self._dist
+        prev_idx, next_idx = tour_idx[:-1], tour_idx[1:]
+        # Einfügen von c zwischen prev und next: d(prev, c) + d(c, next) - d(prev, next)
+        deltas = dist[np.ix_(prev_idx, candidates)].T + dist[np.ix_(candidates, next_idx)] - dist[prev_idx, next_idx]
+        scores = np.broadcast_to((solution.score + self._scores[candidates])[:, None], deltas.shape)
+        self._charge(int(deltas.size))
+        move = self._best_batched_move(solution, scores, deltas)
+        if move is None: return solution
+        row, col = move
+        i = int(col) + 1
+        return self._accept_batched(solution, solution.tour[:i] + [int(candidates[row]) + 1] + solution.tour[i:])
+
+    def _batched_replacement(self, solution):
+        """Gebündelte Variante von `replace_node`: Matrix Tour-Positionen x Kandidaten."""
+        if len(solution.tour) < 3: return solution
+        tour_idx = np.array(solution.tour) - 1
+        candidates = self._unvisited_indices(tour_idx)
+        if len(candidates) == 0: return solution
+        dist = self._dist
+        prev_idx, cur_idx, next_idx = tour_idx[:-2], tour_idx[1:-1], tour_idx[2:]
+        # Austausch von cur gegen c: d(prev, c) + d(c, next) - d(prev, cur) - d(cur, next)
+        removed = dist[prev_idx, cur_idx] + dist[cur_idx, next_idx]
+        deltas = dist[np.ix_(prev_idx, candidates)] + dist[np.ix_(candidates, next_idx)].T - removed[:, None]
+        scores = solution.score - self._scores[cur_idx][:, None] + self._scores[candidates][None, :]
+        self._charge(int(deltas.size))
+        move = self._best_batched_move(solution, scores, deltas)
+        if move is None: return solution
+        row, col = move
+        i = int(row) + 1
+        return self._accept_batched(solution, solution.tour[:i] + [int(candidates[col]) + 1] + solution.tour[i + 1:])
+
 
 # Alte Test
 
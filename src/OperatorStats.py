@@ -0,0 +1,74 @@
+import csv
+import json
+
+STATS_FIELDS = ['kind', 'operator', 'calls', 'seconds', 'evaluations', 'improvements', 'gain', 'skipped',
+                'seconds_per_call', 'evaluations_per_second']
+
+
+class OperatorStats:
+    """
+    Zähler und Zeiten pro Operator (Shaking-Operatoren und Nachbarschaften der VND).
+    Pro (Art, Operator): Aufrufe, CPU-Sekunden, bewertete Nachbarn, Verbesserungen, Summe der Gewinne (siehe AdaptiveSelection.improvement_gain)
+    und wie oft eine Nachbarschaft dank LocalOptimaRegistry übersprungen wurde.
+    Ist die Statistik aus (None in NeighborhoodGenerator / VNS), kostet das nur eine None-Abfrage pro Operator-Aufruf.
+    """
+    def __init__(self):
+        self._entries = {}  # (Art, Operator) -> [Aufrufe, Sekunden, Bewertungen, Verbesserungen, Gewinn, übersprungen]
+
+    def _entry(self, kind, name):
+        entry = self._entries.get((kind, name))
+        if entry is None:
+            entry = self._entries[(kind, name)] = [0, 0.0, 0, 0, 0.0, 0]
+        return entry
+
+    def record(self, kind, name, seconds, evaluations, gain=None):
+        """Verbucht einen Aufruf / gain=None: Erfolg wird später über `credit` nachgetragen (Shaking)."""
+        entry = self._entry(kind, name)
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] += evaluations
+        if gain is not None:
+            self.credit(kind, name, gain)
+
+    def credit(self, kind, name, gain):
+        """Trägt den Gewinn eines Aufrufs nach (zählt als Verbesserung, wenn gain > 0)."""
+        if gain > 0:
+            entry = self._entry(kind, name)
+            entry[3] += 1
+            entry[4] += gain
+
+    def skip(self, kind, name):
+        """Nachbarschaft wurde übersprungen, weil sie für diese Tour schon ohne Verbesserung durchsucht war."""
+        self._entry(kind, name)[5] += 1
+
+    def to_rows(self):
+        """Statistik als Liste von Dicts (eine Zeile pro Operator, sortiert nach Art und Name) / landet so in run_info."""
+        rows = []
+        for (kind, name), (calls, seconds, evaluations, improvements, gain, skipped) in sorted(self._entries.items()):
+            rows.append({
+                'kind': kind,
+                'operator': name,
+                'calls': calls,
+                'seconds': seconds,
+                'evaluations': evaluations,
+                'improvements': improvements,
+                'gain': gain,
+                'skipped': skipped,
+                'seconds_per_call': seconds / calls if calls else 0.0,
+                'evaluations_per_second': evaluations / seconds if seconds > 0 else 0.0,
+            })
+        return rows
+
+
+def write_stats_json(rows, path):
+    """Schreibt die Zeilen aus run_info['operator_stats'] als JSON."""
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(rows, file, indent=2)
+
+
+def write_stats_csv(rows, path):
+    """Schreibt die Zeilen aus run_info['operator_stats'] als CSV (z. B. für die Ergebnis-Sheets)."""
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=STATS_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
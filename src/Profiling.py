@@ -0,0 +1,174 @@
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+
+# Profiling ohne Codeänderung einschalten, z. B. VNS_PROFILE=phases / VNS_PROFILE=phases,cprofile / VNS_PROFILE=sample:0.002
+PROFILE_ENV = 'VNS_PROFILE'
+# Zielordner für .prof / .collapsed / .phases.json (Standard: ./profiles)
+PROFILE_DIR_ENV = 'VNS_PROFILE_DIR'
+
+_NO_PHASE = nullcontext()
+
+
+def no_phase(name):
+    """Ersatz für RunProfiler.phase, wenn nicht profiliert wird / kostet nur einen Funktionsaufruf."""
+    return _NO_PHASE
+
+
+class _PhaseTimer:
+    """Misst Wand- und CPU-Zeit eines Abschnitts und addiert sie auf [Aufrufe, Wandzeit, CPU-Zeit]."""
+    __slots__ = ('totals', '_wall', '_cpu')
+
+    def __init__(self):
+        self.totals = [0, 0.0, 0.0]
+
+    def __enter__(self):
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        totals = self.totals
+        totals[0] += 1
+        totals[1] += time.perf_counter() - self._wall
+        totals[2] += time.process_time() - self._cpu
+        return False
+
+
+class _StackSampler(threading.Thread):
+    """
+    Stichproben-Profiler: liest in festen Abständen den Python-Stack des profilierten Threads
+    und zählt die Stacks im "collapsed"-Format (root;...;leaf Anzahl), das flamegraph.pl und speedscope direkt lesen.
+    """
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if names:
+                self.stacks[';'.join(reversed(names))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class RunProfiler:
+    """
+    Profiling-Modus für einen kompletten Solver-Lauf.
+    Phasen (z. B. load, start_solution, exact, shaking, vnd, pool, checkpoint) werden mit `with profiler.phase(name):` gemessen,
+    jeweils Wandzeit (perf_counter) und CPU-Zeit (process_time).
+    Optional zusätzlich:
+        cprofile: cProfile über den ganzen Lauf / Ausgabe als .prof (pstats, z. B. snakeviz oder flameprof)
+        sample_interval: Stichproben der Stacks alle x Sekunden / Ausgabe als .collapsed (Flamegraph)
+    Dateien landen in `output_dir` unter `name`, wenn output_dir gesetzt ist.
+    """
+    def __init__(self, cprofile=False, sample_interval=None, output_dir=None, name='run'):
+        self.cprofile = cprofile
+        self.sample_interval = sample_interval
+        self.output_dir = output_dir
+        self.name = name
+        self._timers = {}
+        self._profile = None
+        self._sampler = None
+        self._started = False
+
+    @classmethod
+    def from_spec(cls, spec, output_dir=None, name='run'):
+        """
+        Baut einen Profiler aus einer Kurzbeschreibung (kommagetrennt): 'phases', 'cprofile', 'sample' oder 'sample:<Sekunden>'.
+        'cprofile' und 'sample' schalten die Phasenmessung immer mit ein. Leere Beschreibung / '0' -> None (kein Profiling).
+        """
+        if not spec or spec in ('0', 'off'): return None
+        parts = [part.strip() for part in spec.split(',') if part.strip()]
+        cprofile = 'cprofile' in parts
+        sample_interval = None
+        for part in parts:
+            if part == 'sample' or part.startswith('sample:'):
+                sample_interval = float(part.split(':', 1)[1]) if ':' in part else 0.005
+            elif part not in ('phases', 'cprofile', '1', 'on'):
+                raise ValueError(f"Unbekannte Profiling-Option '{part}' (erlaubt: phases, cprofile, sample[:Sekunden])")
+        return cls(cprofile, sample_interval, output_dir, name)
+
+    @classmethod
+    def from_env(cls, spec=None, name='run'):
+        """Profiler aus `spec` (z. B. Parameter 'profile') oder sonst aus der Umgebungsvariable VNS_PROFILE / None, wenn beides fehlt."""
+        if spec is None:
+            spec = os.environ.get(PROFILE_ENV)
+        return cls.from_spec(spec, os.environ.get(PROFILE_DIR_ENV, 'profiles'), name)
+
+    def phase(self, name):
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = self._timers[name] = _PhaseTimer()
+        return timer
+
+    def start(self):
+        """Startet die Gesamtmessung ('total') sowie cProfile bzw. den Stichproben-Thread (Phasen laufen auch ohne start)."""
+        if self._started: return
+        self._started = True
+        self.phase('total').__enter__()
+        if self.cprofile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        if self.sample_interval:
+            self._sampler = _StackSampler(threading.get_ident(), self.sample_interval)
+            self._sampler.start()
+
+    def stop(self):
+        """Beendet die Messung und schreibt die Dateien (falls output_dir gesetzt). Gibt die Phasen-Zusammenfassung zurück."""
+        if not self._started: return self.summary()
+        self._started = False
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        self._timers['total'].__exit__(None, None, None)
+        if self.output_dir:
+            self.write(self.output_dir)
+        return self.summary()
+
+    def summary(self):
+        """Phase -> {'calls', 'wall', 'cpu'} in Sekunden."""
+        summary = {}
+        for name, timer in self._timers.items():
+            calls, wall, cpu = timer.totals
+            summary[name] = {'calls': calls, 'wall': wall, 'cpu': cpu}
+        return summary
+
+    def report(self):
+        """Lesbare Tabelle der Phasen (Anteil bezogen auf 'total', falls vorhanden)."""
+        summary = self.summary()
+        total_wall = summary.get('total', {}).get('wall') or sum(entry['wall'] for entry in summary.values()) or 1.0
+        lines = [f"{'Phase':<16}{'Aufrufe':>10}{'Wand [s]':>12}{'CPU [s]':>12}{'Anteil':>9}"]
+        for name, entry in sorted(summary.items(), key=lambda item: -item[1]['wall']):
+            lines.append(f"{name:<16}{entry['calls']:>10}{entry['wall']:>12.3f}{entry['cpu']:>12.3f}{entry['wall'] / total_wall:>9.1%}")
+        return '\n'.join(lines)
+
+    def write(self, output_dir):
+        """Schreibt <name>.phases.json sowie optional <name>.prof und <name>.collapsed."""
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.join(output_dir, self.name)
+        with open(f"{base}.phases.json", 'w', encoding='utf-8') as file:
+            json.dump(self.summary(), file, indent=2)
+        if self._profile is not None:
+            self._profile.dump_stats(f"{base}.prof")
+        if self._sampler is not None:
+            with open(f"{base}.collapsed", 'w', encoding='utf-8') as file:
+                for stack, count in self._sampler.stacks.most_common():
+                    file.write(f"{stack} {count}\n")
@@ -0,0 +1,168 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+# Spaltenreihenfolge für CSV/Excel (weitere Felder folgen in der Reihenfolge ihres ersten Auftretens)
+RESULT_FIELDS = ['instance', 'seed', 'start_method', 'start_score', 'score', 'distance', 'is_valid', 'improved', 'elapsed',
+                 'cpu_seconds', 'iterations', 'restarts', 'stop_reason', 'upper_bound', 'gap', 'tour', 'params', 'finished_at']
+
+
+def read_rows(path):
+    """Alle vollständigen Zeilen einer Ergebnisdatei (eine abgebrochene letzte Zeile wird ignoriert, fehlende Datei -> leer)."""
+    rows = []
+    if not os.path.exists(path): return rows
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return rows
+
+
+def _ends_with_newline(path):
+    """True, wenn die Datei leer ist oder mit einem Zeilenumbruch endet."""
+    with open(path, 'rb') as file:
+        file.seek(0, os.SEEK_END)
+        if file.tell() == 0: return True
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) == b'\n'
+
+
+class ResultsSink:
+    """
+    Ergebnisdatei im JSON-Lines-Format: jeder fertige Lauf wird sofort als eine Zeile angehängt und geschrieben.
+    Bei einem Absturz gehen höchstens die Läufe verloren, die noch nicht fertig waren (statt aller Ergebnisse wie beim
+    Excel-Export am Ende). Eine abgebrochene letzte Zeile wird beim Öffnen abgeschlossen und beim Lesen ignoriert.
+    Kommt ohne pandas aus / Excel oder CSV entstehen nachträglich mit export_excel bzw. export_csv.
+
+    path: Zieldatei oder '-' für die Standardausgabe (für Shell-Pipelines, wird nicht geschlossen)
+    fsync: zusätzlich bis auf die Platte schreiben (übersteht auch einen Rechnerabsturz, kostet pro Zeile einige ms)
+    """
+    def __init__(self, path, fsync=False):
+        self.path = path
+        self.fsync = fsync
+        self.written = 0
+        if path == '-':
+            self._file = sys.stdout
+            self.fsync = False
+            return
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        if not _ends_with_newline(path):
+            # Sonst würde die nächste Zeile an die abgebrochene angehängt
+            self._file.write('\n')
+
+    def write(self, row):
+        self._file.write(json.dumps(row) + '\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.written += 1
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def result_row(input_data, start_solution, method, solution, elapsed, seed=None, params=None, run_info=None, **extra):
+    """
+    Ergebniszeile eines Laufs (Instanz, Start, Ergebnis mit Tour, Zeit, Parameter und Kennzahlen aus run_info).
+    Weitere Felder (z. B. job_id) können über `extra` ergänzt werden.
+    """
+    run_info = run_info or {}
+    row = {
+        'instance': input_data.name,
+        'seed': seed,
+        'start_method': method,
+        'start_score': start_solution.score,
+        'score': solution.score,
+        'distance': solution.total_distance,
+        'is_valid': solution.is_valid,
+        'improved': solution.score > start_solution.score,
+        'elapsed': elapsed,
+        'iterations': run_info.get('iterations'),
+        'restarts': run_info.get('restarts'),
+        'stop_reason': run_info.get('stop_reason'),
+        'upper_bound': run_info.get('upper_bound'),
+        'gap': run_info.get('gap'),
+        'tour': list(solution.tour),
+        'params': params,
+        'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    if 'evaluations' in run_info:
+        row['evaluations'] = run_info['evaluations']
+    row.update(extra)
+    return row
+
+
+def _columns(rows):
+    seen = [field for field in RESULT_FIELDS if any(field in row for row in rows)]
+    for row in rows:
+        for key in row:
+            if key not in seen:
+                seen.append(key)
+    return seen
+
+
+def _flat(value):
+    """Listen und Dicts (Tour, Parameter) als JSON-Text, damit sie in eine Tabellenzelle passen."""
+    return json.dumps(value) if isinstance(value, (list, dict)) else value
+
+
+def export_csv(results_path, csv_path):
+    """Schreibt eine Ergebnisdatei als CSV (ohne pandas). Rückgabe: Anzahl Zeilen."""
+    rows = read_rows(results_path)
+    columns = _columns(rows)
+    with open(csv_path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=columns)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: _flat(value) for key, value in row.items()})
+    return len(rows)
+
+
+def export_excel(results_path, excel_path):
+    """
+    Optionaler Nachbearbeitungsschritt: Ergebnisdatei als Excel-Tabelle wie bisher im Notebook.
+    pandas und openpyxl werden erst hier importiert, Läufe selbst brauchen sie nicht. Rückgabe: Anzahl Zeilen.
+    """
+    try:
+        import pandas as pd
+    except ImportError as e:
+        raise ImportError("Für den Excel-Export werden pandas und openpyxl benötigt: pip install pandas openpyxl") from e
+    rows = read_rows(results_path)
+    frame = pd.DataFrame([{key: _flat(value) for key, value in row.items()} for row in rows], columns=_columns(rows))
+    frame.to_excel(excel_path, index=False, engine='openpyxl')
+    return len(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exportiert eine Ergebnisdatei (JSON Lines) als CSV oder Excel.")
+    parser.add_argument('results', help="Ergebnisdatei (JSON Lines)")
+    parser.add_argument('--csv', help="Ziel als CSV")
+    parser.add_argument('--excel', help="Ziel als Excel (.xlsx, benötigt pandas und openpyxl)")
+    args = parser.parse_args(argv)
+    if not args.csv and not args.excel:
+        parser.error("mindestens eines von --csv oder --excel angeben")
+    if args.csv:
+        print(f"{export_csv(args.results, args.csv)} Zeilen -> {args.csv}")
+    if args.excel:
+        print(f"{export_excel(args.results, args.excel)} Zeilen -> {args.excel}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import bisect
+
+
+def node_bitset(tour):
+    """
+    Kodiert die Knotenmenge einer Tour (ohne Depot) als Integer-Bitset.
+    Bit i ist gesetzt, wenn Knoten i besucht wird. Schnitt/Vereinigung werden so zu & und |.
+    """
+    mask = 0
+    for node_id in tour[1:-1]:
+        mask |= 1 << node_id
+    return mask
+
+
+def bitset_similarity(mask_a, mask_b):
+    """Jaccard-Ähnlichkeit zweier Bitsets über popcount. Gleiche Definition wie `similarity` in VNS.py."""
+    union = mask_a | mask_b
+    if union == 0: return 1.0
+    return (mask_a & mask_b).bit_count() / union.bit_count()
+
+
+def pool_key(solution):
+    """
+    Sortierschlüssel des Pools.
+    Kriterien: 1. Score (hoch), 2. Distanz (niedrig), 3. Tour-Inhalt (eindeutig) / damit bleibt die Reihenfolge deterministisch
+    """
+    return (solution.score, -solution.total_distance, tuple(solution.tour))
+
+
+class SolutionPool:
+    """
+    Pool guter und diverser Lösungen für die Restarts der VNS.
+    Jede Lösung wird zusammen mit ihrem Knoten-Bitset gespeichert, dadurch kostet ein Ähnlichkeitsvergleich nur ein paar Integer-Operationen.
+    Die Reihenfolge wird per bisect inkrementell gehalten (aufsteigend nach `pool_key`, die beste Lösung steht also hinten),
+    statt nach jedem Einfügen den ganzen Pool neu zu sortieren. Nach außen wird immer die Reihenfolge "beste zuerst" gezeigt.
+    """
+    def __init__(self, max_size=12, similarity_threshold=0.85, score_ratio=0.85):
+        self.max_size = max_size
+        self.similarity_threshold = similarity_threshold
+        self.score_ratio = score_ratio
+        self._keys = []        # aufsteigend sortierte pool_keys
+        self._solutions = []   # Lösungen, parallel zu _keys
+        self._masks = []       # Knoten-Bitsets, parallel zu _keys
+
+    def insert(self, solution):
+        """Fügt eine Lösung ohne Qualitäts-/Diversitätsprüfung ein (z. B. die Startlösung)."""
+        key = pool_key(solution)
+        # bisect_left: bei gleichem Schlüssel landet die neue Lösung hinter der älteren (in der Sicht "beste zuerst"), wie bei einem stabilen Sort
+        index = bisect.bisect_left(self._keys, key)
+        self._keys.insert(index, key)
+        self._solutions.insert(index, solution)
+        self._masks.insert(index, node_bitset(solution.tour))
+        if len(self._keys) > self.max_size:
+            # Entferne die schlechteste Lösung, wenn der Pool voll ist
+            del self._keys[0]
+            del self._solutions[0]
+            del self._masks[0]
+
+    def try_add(self, candidate, best):
+        """Fügt eine Kandidatenlösung hinzu, wenn sie gut und divers genug ist. Gibt True zurück, wenn sie aufgenommen wurde."""
+        # Ignoriere Lösungen die deutlich schlechter sind als die bisher beste
+        if best.score > 0 and candidate.score < self.score_ratio * best.score: return False
+
+        # Ignoriere Lösungen, die zu ähnlich zu bereits im Pool vorhandenen sind
+        mask = node_bitset(candidate.tour)
+        for other in self._masks:
+            if bitset_similarity(other, mask) > self.similarity_threshold:
+                return False
+
+        self.insert(candidate)
+        return True
+
+    def select(self, rnd, best):
+        """Wählt eine Lösung aus dem Pool. Bevorzugt Lösungen, die unähnlicher zur besten Lösung sind um diversität zu erzeugen"""
+        if not self._solutions: return best
+        if len(self._solutions) == 1: return self._solutions[0]
+
+        max_score = self._keys[-1][0]
+        if max_score == 0: max_score = 1
+
+        # Gewichtung kombiniert Diversität (Unähnlichkeit zu `best`) und Qualität (Score).
+        best_mask = node_bitset(best.tour)
+        weights = [(1 - bitset_similarity(mask, best_mask)) * 0.5 + (sol.score / max_score) * 0.5
+                   for sol, mask in zip(reversed(self._solutions), reversed(self._masks))]
+        return rnd.choices(self.solutions, weights=weights, k=1)[0]
+
+    @property
+    def solutions(self):
+        """Die Lösungen des Pools, beste zuerst."""
+        return self._solutions[::-1]
+
+    def __len__(self):
+        return len(self._solutions)
+
+    def __iter__(self):
+        return reversed(self._solutions)
@@ -0,0 +1,135 @@
+import os
+import time
+import random
+from InputData import InputData
+from StartSolutionSelector import select_best_start_solution
+from ExactSolver import solve_exact
+from VNS import DEFAULT_PARAMS, run_vns_parametrized
+from Deadline import Deadline, EvaluationBudget
+from Profiling import RunProfiler, no_phase
+
+
+def solve_instance(input_data, seed=None, rnd=None, params=None, global_start_time=None, verbose=True, deadline=None, run_info=None, profiler=None):
+    """
+    Kompletter Lösungsdurchlauf für eine Instanz: Startlösung + exakter Solver oder VNS.
+    Kleine Instanzen (NodeCount <= 'exact_node_threshold') werden per Branch-and-Bound (ExactSolver.py) bewiesen optimal gelöst.
+    Schafft der exakte Solver das nicht innerhalb von 'exact_max_time' Sekunden, läuft mit der Restzeit die normale VNS weiter,
+    ausgehend von der besten bis dahin gefundenen Lösung. Größere Instanzen gehen direkt in die VNS.
+
+    Parameter wie bei run_vns_parametrized (fehlende Werte aus DEFAULT_PARAMS), zusätzlich:
+        exact_node_threshold: Maximale Knotenanzahl für den exakten Solver (0 schaltet ihn ab) / Standard 24:
+                              Instance_2 (20 Knoten) ist in 0,1 s bewiesen, Instance_1/3 (31/32 Knoten) brauchen 20-40 s,
+                              die VNS findet dort dieselben Scores in wenigen Sekunden
+        exact_max_time: Zeitbudget des exakten Solvers in Sekunden (höchstens die Restzeit)
+        max_evaluations: Budget in Bewertungen statt Sekunden für den ganzen Durchlauf (Startlösung, exakter Solver, VNS),
+                         der exakte Solver bekommt davon höchstens 'exact_max_evaluations' (Standard: ein Drittel)
+        profile: Profiling-Modus (siehe Profiling.py), alternativ Umgebungsvariable VNS_PROFILE
+
+    Rückgabe:
+        (beste_Lösung, gewählte_Startmethode) / run_info enthält zusätzlich 'solver' und 'proven_optimal'
+    """
+    if rnd is None:
+        rnd = random.Random(seed)
+    if global_start_time is None:
+        global_start_time = time.time()
+    run_params = dict(DEFAULT_PARAMS)
+    if params:
+        run_params.update(params)
+    if run_info is None:
+        run_info = {}
+    if deadline is None and run_params.get('max_evaluations') is not None:
+        deadline = EvaluationBudget(run_params['max_evaluations'])
+    elif deadline is None:
+        deadline = Deadline.from_wall_clock(global_start_time, run_params.get('max_time', 180),
+                                            check_every=run_params.get('deadline_check_every', 64))
+
+    exact_node_threshold = run_params.get('exact_node_threshold', 24)
+    exact_max_time = run_params.get('exact_max_time', 10)
+
+    owns_profiler = profiler is None
+    if owns_profiler:
+        profiler = _profiler_for(input_data.name, run_params)
+        if profiler is not None:
+            profiler.start()
+    try:
+        return _solve(input_data, rnd, run_params, global_start_time, verbose, deadline, run_info, profiler,
+                      exact_node_threshold, exact_max_time)
+    finally:
+        if profiler is not None and owns_profiler:
+            _finish_profiler(profiler, run_info, verbose)
+
+
+def solve_instance_file(instance_path, seed=None, params=None, verbose=True, run_info=None):
+    """
+    Wie `solve_instance`, aber inklusive Einlesen der Instanz (JSON). Die Zeit zählt ab dem Aufruf, also mit Einlesen.
+    Im Profiling-Modus erscheint das Einlesen als eigene Phase 'load'.
+    """
+    global_start_time = time.time()
+    run_params = dict(DEFAULT_PARAMS)
+    if params:
+        run_params.update(params)
+    if run_info is None:
+        run_info = {}
+    profiler = _profiler_for(os.path.splitext(os.path.basename(instance_path))[0], run_params)
+    phase = profiler.phase if profiler is not None else no_phase
+    if profiler is not None:
+        profiler.start()
+    try:
+        with phase('load'):
+            input_data = InputData(instance_path)
+        return solve_instance(input_data, seed=seed, params=run_params, global_start_time=global_start_time, verbose=verbose,
+                              run_info=run_info, profiler=profiler)
+    finally:
+        if profiler is not None:
+            _finish_profiler(profiler, run_info, verbose)
+
+
+def _profiler_for(name, run_params):
+    """Profiler für einen Lauf aus Parameter 'profile' bzw. VNS_PROFILE (None = kein Profiling)."""
+    return RunProfiler.from_env(run_params.get('profile'), name=f"{name or 'run'}-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}")
+
+
+def _finish_profiler(profiler, run_info, verbose):
+    """Stoppt den Profiler, schreibt die Dateien und legt die Phasen-Zusammenfassung in run_info ab."""
+    profiler.stop()
+    if run_info is not None:
+        run_info['profile'] = profiler.summary()
+    if verbose:
+        print(profiler.report())
+
+
+def _solve(input_data, rnd, run_params, global_start_time, verbose, deadline, run_info, profiler, exact_node_threshold, exact_max_time):
+    phase = profiler.phase if profiler is not None else no_phase
+    with phase('start_solution'):
+        start_solution, method = select_best_start_solution(input_data, rnd=rnd, deadline=deadline)
+    run_info['start_method'] = method
+    run_info['start_score'] = start_solution.score
+
+    if input_data.node_count <= exact_node_threshold:
+        if isinstance(deadline, EvaluationBudget):
+            exact_deadline = EvaluationBudget(min(run_params.get('exact_max_evaluations', deadline.max_evaluations // 3), deadline.remaining()))
+        else:
+            exact_deadline = Deadline(min(exact_max_time, deadline.remaining()), check_every=deadline.check_every, clock=deadline.clock)
+        with phase('exact'):
+            solution, proven = solve_exact(input_data, incumbent=start_solution, deadline=exact_deadline)
+        if isinstance(deadline, EvaluationBudget):
+            # Die Bewertungen des exakten Solvers zählen zum Gesamtbudget
+            deadline.charge(exact_deadline.evaluations)
+        if proven:
+            run_info['solver'] = 'exact'
+            run_info['proven_optimal'] = True
+            run_info['upper_bound'] = solution.score
+            run_info['gap'] = 0.0
+            run_info['elapsed'] = deadline.elapsed()
+            if verbose:
+                print(f"Exakt gelöst (bewiesen optimal): Score={solution.score}, Distanz={solution.total_distance:.2f} in {exact_deadline.elapsed():.2f} s")
+            return solution, method
+        if verbose:
+            print(f"Exakter Solver nach {exact_deadline.elapsed():.1f} s ohne Beweis abgebrochen, weiter mit VNS ab Score {solution.score}")
+        start_solution = solution
+
+    run_info['solver'] = 'vns'
+    best = run_vns_parametrized(input_data, start_solution, rnd, run_params, global_start_time, verbose, deadline=deadline, run_info=run_info,
+                                profiler=profiler)
+    run_info['proven_optimal'] = run_info.get('upper_bound') is not None and best.score >= run_info['upper_bound']
+    return best, method
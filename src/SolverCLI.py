@@ -0,0 +1,99 @@
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+# Bewusst nur Standardbibliothek auf Modulebene: Solver-Module (und damit ggf. NumPy) werden erst in run() geladen,
+# pandas gar nicht. So kostet `--help` oder ein Lauf auf einer kleinen Instanz kaum Startzeit.
+
+
+def parse_param(text):
+    """'key=value' -> (key, value); value wird als JSON gelesen (Zahlen, true/false, null, Listen), sonst als Text."""
+    key, separator, value = text.partition('=')
+    if not separator or not key:
+        raise argparse.ArgumentTypeError(f"Parameter '{text}' muss die Form key=value haben")
+    try:
+        return key, json.loads(value)
+    except json.JSONDecodeError:
+        return key, value
+
+
+def load_params(text):
+    """--params: JSON-Objekt direkt oder Pfad zu einer JSON-Datei."""
+    if os.path.exists(text):
+        with open(text, 'r', encoding='utf-8') as file:
+            text = file.read()
+    params = json.loads(text)
+    if not isinstance(params, dict):
+        raise ValueError("--params muss ein JSON-Objekt sein")
+    return params
+
+
+def run(instances, seeds=(1,), params=None, output='-', verbose=False):
+    """
+    Startlösung + VNS für jede Instanz und jeden Seed. Jede Ergebniszeile geht sofort in die ResultsSink (Standard: stdout).
+    Meldungen der VNS (verbose) gehen nach stderr, damit stdout maschinenlesbar bleibt.
+    Rückgabe: Anzahl fehlgeschlagener Läufe (Fehlerzeilen mit status 'error').
+    """
+    import random
+    from InputData import load_instance
+    from ResultsSink import ResultsSink, result_row
+    from StartSolutionSelector import select_best_start_solution
+    from VNS import DEFAULT_PARAMS, run_vns_parametrized
+
+    run_params = dict(DEFAULT_PARAMS)
+    run_params.update(params or {})
+    failed = 0
+    with ResultsSink(output) as sink:
+        for path in instances:
+            for seed in seeds:
+                started = time.time()
+                try:
+                    with redirect_stdout(sys.stderr):
+                        data = load_instance(path)
+                        rnd = random.Random(seed)
+                        start_solution, method = select_best_start_solution(data, rnd=rnd)
+                        run_info = {}
+                        best = run_vns_parametrized(data, start_solution, rnd, dict(run_params), started, verbose=verbose, run_info=run_info)
+                    row = result_row(data, start_solution, method, best, time.time() - started, seed, params or {}, run_info,
+                                     instance_path=path, status='ok')
+                except Exception as e:
+                    failed += 1
+                    row = {'instance_path': path, 'seed': seed, 'params': params or {}, 'status': 'error',
+                           'error': f"{type(e).__name__}: {e}", 'elapsed': time.time() - started}
+                sink.write(row)
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Löst OP-Instanzen (Startlösung + VNS) und schreibt eine JSON-Zeile pro Lauf.",
+        epilog="Beispiel: python SolverCLI.py Instance_1.json --seeds 1 2 3 --max-time 10 -p use_upper_bound=false > results.jsonl")
+    parser.add_argument('instances', nargs='+', help="Instanzdateien (JSON)")
+    parser.add_argument('--seeds', type=int, nargs='+', default=[1], help="Seeds, ein Lauf pro Instanz und Seed (Standard: 1)")
+    parser.add_argument('--params', type=load_params, default={}, help="Parameter als JSON-Objekt oder Pfad zu einer JSON-Datei")
+    parser.add_argument('-p', '--param', type=parse_param, action='append', default=[], metavar='KEY=VALUE',
+                        help="Einzelner Parameter (überschreibt --params), mehrfach angebbar")
+    parser.add_argument('--max-time', type=float, help="Zeitlimit pro Lauf in Sekunden (Parameter max_time)")
+    parser.add_argument('--max-evaluations', type=int, help="Budget in Bewertungen statt Sekunden (Parameter max_evaluations)")
+    parser.add_argument('--archive', help="Ordner des Elite-Archivs: Warmstart aus früheren Läufen, Ergebnisse fließen zurück")
+    parser.add_argument('-o', '--output', default='-', help="Ergebnisdatei (JSON Lines, wird ergänzt) / Standard: stdout")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Fortschritt der VNS nach stderr ausgeben")
+    args = parser.parse_args(argv)
+
+    params = dict(args.params)
+    params.update(dict(args.param))
+    if args.max_time is not None:
+        params['max_time'] = args.max_time
+    if args.max_evaluations is not None:
+        params['max_evaluations'] = args.max_evaluations
+    if args.archive is not None:
+        params['elite_archive'] = args.archive
+    failed = run(args.instances, args.seeds, params, args.output, args.verbose)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
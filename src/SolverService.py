@@ -0,0 +1,214 @@
+import asyncio
+import itertools
+import multiprocessing
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from InputData import load_instance
+from StartSolutionSelector import select_best_start_solution
+from VNS import DEFAULT_PARAMS, iterate_vns_parametrized
+from Deadline import Deadline
+
+
+class ServiceOverloaded(RuntimeError):
+    """Wird geworfen, wenn der Service bereits `max_pending` offene Anfragen hat (Admission Control)."""
+
+
+class SolveResult:
+    """
+    Ergebnis einer Anfrage an den SolverService.
+    solution: beste gefundene TourSolution
+    start_method / start_score: gewählte Startheuristik und deren Score
+    elapsed: Sekunden vom Eingang der Anfrage bis zum Ende im Worker
+    cancelled: True, wenn die Anfrage im Worker über das Abbruchsignal beendet wurde
+    run_info: Kennzahlen aus der VNS (siehe run_vns_parametrized)
+    """
+    def __init__(self, solution, start_method, start_score, elapsed, cancelled, run_info):
+        self.solution = solution
+        self.start_method = start_method
+        self.start_score = start_score
+        self.elapsed = elapsed
+        self.cancelled = cancelled
+        self.run_info = run_info
+
+
+# === Worker-Seite (läuft in den Prozessen des Pools) ===
+
+# Geladene Instanzen bleiben pro Worker-Prozess im Cache (InputData.load_instance)
+# Viele kleine Anfragen auf dieselbe Instanz zahlen so das Einlesen und die Distanzmatrix nur einmal.
+
+
+def _init_worker(preload_paths):
+    """Initializer des Prozesspools: lädt häufig genutzte Instanzen schon beim Start des Workers."""
+    for path in preload_paths:
+        load_instance(path)
+
+
+class _CancellableDeadline(Deadline):
+    """
+    Deadline, die zusätzlich abläuft, sobald der Service das Abbruchsignal (multiprocessing Event) setzt.
+    Das Event ist ein Manager-Proxy, jede Abfrage ein IPC-Roundtrip / deshalb höchstens alle `cancel_interval` Sekunden,
+    die Uhr selbst weiter bei jeder Prüfung. Ein Abbruch greift so spätestens `cancel_interval` Sekunden später.
+    """
+    def __init__(self, seconds, cancel_event, check_every=64, cancel_interval=0.05):
+        super().__init__(seconds, check_every=check_every)
+        self.cancel_event = cancel_event
+        self.cancel_interval = cancel_interval
+        self.cancelled = False
+        self._next_cancel_check = time.monotonic()
+
+    def expired(self):
+        if not self._expired:
+            now = time.monotonic()
+            if now >= self._next_cancel_check:
+                self._next_cancel_check = now + self.cancel_interval
+                if self.cancel_event.is_set():
+                    self.cancelled = True
+                    self._expired = True
+        return super().expired()
+
+
+def _solve_in_worker(request_id, instance_path, seed, params, deadline_at, progress_queue, cancel_event):
+    """
+    Führt eine komplette Anfrage im Worker aus: Instanz laden, Startlösung wählen, VNS.
+    `deadline_at` ist ein time.time()-Zeitpunkt, damit auch die Wartezeit in der Warteschlange zum Budget zählt.
+    Jede neue beste Lösung wird als (request_id, VNSProgress) in die Progress-Queue gelegt.
+    """
+    received_at = time.time()
+    budget = max(0.0, deadline_at - received_at)
+    deadline = _CancellableDeadline(budget, cancel_event, check_every=params.get('deadline_check_every', 64),
+                                    cancel_interval=params.get('cancel_check_interval', 0.05))
+
+    data = load_instance(instance_path)
+    rnd = random.Random(seed)
+    start_solution, method = select_best_start_solution(data, rnd=rnd, deadline=deadline)
+
+    run_params = dict(params)
+    run_params['max_time'] = budget
+    run_info = {}
+    best = start_solution
+    for progress in iterate_vns_parametrized(data, start_solution, rnd, run_params, received_at, verbose=False, deadline=deadline, run_info=run_info):
+        best = progress.solution
+        if progress_queue is not None:
+            progress_queue.put((request_id, progress))
+
+    return SolveResult(best, method, start_solution.score, time.time() - received_at, deadline.cancelled, run_info)
+
+
+# === Service-Seite (läuft im asyncio-Eventloop) ===
+
+class SolverService:
+    """
+    asyncio-Schnittstelle für den Solver, z. B. für einen Online-Planungsservice mit vielen parallelen OP-Instanzen.
+    Die eigentliche Rechnung läuft in einem begrenzten Prozesspool, damit der Eventloop nie blockiert.
+
+    - Admission Control: mehr als `max_pending` offene Anfragen werden sofort mit ServiceOverloaded abgelehnt.
+    - Deadlines: jede Anfrage hat ein Zeitbudget ab Eingang; der Worker bricht kooperativ ab (Deadline.py),
+      der Service wartet höchstens `grace_period` Sekunden länger.
+    - Abbruch: wird der wartende Task abgebrochen, bekommt der Worker ein Abbruchsignal und hört nach kurzer Zeit auf.
+    - Fortschritt: optionaler Callback, der mit jedem VNSProgress der Anfrage im Eventloop aufgerufen wird.
+    - Wiederverwendung: die Worker-Prozesse bleiben bestehen und cachen geladene Instanzen (`preload` lädt sie schon beim Start).
+
+    Verwendung:
+        async with SolverService(max_workers=4) as service:
+            result = await service.solve("Instanzen/Instance_1.json", seed=42, deadline=5)
+    """
+    def __init__(self, max_workers=None, max_pending=64, default_params=None, grace_period=2.0, preload=()):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.default_params = dict(DEFAULT_PARAMS if default_params is None else default_params)
+        self.grace_period = grace_period
+        self.preload = tuple(preload)
+        self._executor = None
+        self._manager = None
+        self._progress_queue = None
+        self._reader = None
+        self._loop = None
+        self._callbacks = {}
+        self._pending = 0
+        self._request_ids = itertools.count(1)
+
+    async def start(self):
+        """Startet Prozesspool, Manager (für Abbruchsignale/Progress-Queue) und den Progress-Leser."""
+        if self._executor is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker, initargs=(self.preload,))
+        self._manager = multiprocessing.Manager()
+        self._progress_queue = self._manager.Queue()
+        self._reader = threading.Thread(target=self._read_progress, name="solver-progress", daemon=True)
+        self._reader.start()
+
+    async def close(self):
+        """Wartet auf laufende Worker und gibt alle Ressourcen frei."""
+        if self._executor is None:
+            return
+        await self._loop.run_in_executor(None, self._executor.shutdown, True)
+        self._progress_queue.put(None)
+        await self._loop.run_in_executor(None, self._reader.join)
+        self._manager.shutdown()
+        self._executor = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @property
+    def pending(self):
+        """Anzahl der angenommenen, noch nicht beantworteten Anfragen."""
+        return self._pending
+
+    def _read_progress(self):
+        """Hintergrund-Thread: verteilt Fortschrittsmeldungen aus den Workern an die Callbacks im Eventloop."""
+        while True:
+            item = self._progress_queue.get()
+            if item is None:
+                return
+            request_id, progress = item
+            callback = self._callbacks.get(request_id)
+            if callback is not None:
+                self._loop.call_soon_threadsafe(callback, progress)
+
+    async def solve(self, instance_path, seed=None, params=None, deadline=None, progress_callback=None):
+        """
+        Löst eine Instanz und gibt ein SolveResult zurück.
+        deadline: Zeitbudget in Sekunden ab jetzt (inkl. Wartezeit im Pool). Standard ist `max_time` aus den Parametern.
+        Wirft ServiceOverloaded, wenn zu viele Anfragen offen sind, und asyncio.TimeoutError, wenn der Worker
+        auch nach `grace_period` nicht fertig ist.
+        """
+        if self._executor is None:
+            raise RuntimeError("SolverService wurde nicht gestartet (start() oder async with verwenden).")
+        if self._pending >= self.max_pending:
+            raise ServiceOverloaded(f"Zu viele offene Anfragen ({self._pending}/{self.max_pending}).")
+
+        run_params = dict(self.default_params)
+        if params:
+            run_params.update(params)
+        seconds = run_params.get('max_time', 180) if deadline is None else deadline
+
+        request_id = next(self._request_ids)
+        cancel_event = self._manager.Event()
+        if progress_callback is not None:
+            self._callbacks[request_id] = progress_callback
+
+        self._pending += 1
+        future = self._executor.submit(
+            _solve_in_worker, request_id, os.path.abspath(instance_path), seed, run_params,
+            time.time() + seconds, self._progress_queue if progress_callback is not None else None, cancel_event
+        )
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=seconds + self.grace_period)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            # Noch nicht gestartete Anfragen werden aus der Warteschlange genommen, laufende bekommen das Abbruchsignal
+            future.cancel()
+            cancel_event.set()
+            raise
+        finally:
+            self._pending -= 1
+            self._callbacks.pop(request_id, None)
@@ -1,7 +1,7 @@
 
 from ConstructiveHeuristic import generate_solution
 
-def select_best_start_solution(input_data, methods=None, seed=None, rnd=None):
+def select_best_start_solution(input_data, methods=None, seed=None, rnd=None, deadline=None):
     """
     Generiert mehrere Startlösungen (z. B. greedy, best_insertion) #shortest_path, efficiency)
     und wählt die beste basierend auf dem Score für best mögliche Startlösung
@@ -11,6 +11,7 @@ def select_best_start_solution(input_data, methods=None, seed=None, rnd=None):
         methods: Liste von Methoden-Namen als Strings. Wenn None → Standardmethoden.
         seed: Der Seed für die Zufallszahlengenerierung.
         rnd: Ein bereits initialisiertes random.Random Objekt / festgelegt meist im Notebook 
+        deadline: Optionales Zeitlimit (Deadline.py), wird an die Heuristiken weitergereicht
 
     Rückgabe:
         (beste_Lösung, gewählte_Methode)
@@ -21,7 +22,7 @@ def select_best_start_solution(input_data, methods=None, seed=None, rnd=None):
     candidates = []
     for method in methods:
         try:
-            sol = generate_solution(input_data, method=method, seed=seed, rnd=rnd)
+            sol = generate_solution(input_data, method=method, seed=seed, rnd=rnd, deadline=deadline)
             candidates.append((sol, method))
         except Exception as e:
             print(f"⚠ Fehler bei Methode '{method}': {e}")
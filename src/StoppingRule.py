@@ -0,0 +1,63 @@
+class ConvergenceStopper:
+    """
+    Konvergenzabhängiges Abbruchkriterium für die VNS (zusätzlich zu max_time und vns_stagnation_limit).
+    Schätzt aus dem bisherigen Verlauf der besten Lösung den erwarteten Gewinn pro Sekunde und meldet Abbruch,
+    sobald er unter `min_gain_rate` fällt. Gemessen in Sekunden statt Iterationen, damit dieselbe Einstellung
+    auf Instance_1 wie auf Instance_5 passt.
+
+    Schätzung: mittlerer relativer Gewinn einer der letzten `window` Verbesserungen, geteilt durch die erwartete Wartezeit
+    auf die nächste. Die Wartezeit ist der mittlere Abstand dieser Verbesserungen, aber mindestens die Zeit seit der letzten
+    (so lange hat es ja schon gedauert), die Rate sinkt also von selbst, je länger nichts kommt.
+    Abgebrochen wird nur, wenn zusätzlich die Zeit seit der letzten Verbesserung `patience` mal so lang ist wie die
+    größte bisherige Lücke zwischen zwei Verbesserungen (eine lange Pause allein ist in der VNS normal) und mindestens
+    `min_time` Sekunden gerechnet wurden.
+
+    min_gain_rate: Schwelle als Anteil des aktuellen Scores pro Sekunde (z. B. 1e-3 = 0,1 % pro Sekunde)
+    """
+    def __init__(self, min_gain_rate, window=5, patience=2.0, min_time=10.0):
+        self.min_gain_rate = min_gain_rate
+        self.window = window
+        self.patience = patience
+        self.min_time = min_time
+        self._times = []
+        self._scores = []
+        self._max_gap = 0.0
+
+    def start(self, elapsed, score):
+        """Startpunkt (Zeit und Score der Startlösung), nur wenn noch kein Verlauf vorhanden ist (z. B. nach set_state)."""
+        if not self._times:
+            self._times.append(elapsed)
+            self._scores.append(score)
+
+    def improved(self, elapsed, score):
+        """Neue beste Lösung / nur echte Score-Gewinne zählen, kürzere Distanz bei gleichem Score nicht."""
+        if not self._scores or score > self._scores[-1]:
+            if self._times:
+                self._max_gap = max(self._max_gap, elapsed - self._times[-1])
+            self._times.append(elapsed)
+            self._scores.append(score)
+
+    def gain_rate(self, elapsed):
+        """Erwarteter relativer Gewinn pro Sekunde (0.0 ohne jede Verbesserung)."""
+        if not self._times: return float('inf')
+        count = min(self.window, len(self._times) - 1)
+        if count == 0: return 0.0
+        base = len(self._times) - 1 - count
+        mean_gain = (self._scores[-1] - self._scores[base]) / count / max(1, self._scores[-1])
+        mean_gap = (self._times[-1] - self._times[base]) / count
+        wait = max(mean_gap, elapsed - self._times[-1])
+        return mean_gain / wait if wait > 0 else float('inf')
+
+    def should_stop(self, elapsed):
+        if not self._times or elapsed - self._times[0] < self.min_time: return False
+        if elapsed - self._times[-1] < self.patience * self._max_gap: return False
+        return self.gain_rate(elapsed) < self.min_gain_rate
+
+    def get_state(self):
+        """Verlauf als reine Daten (für Checkpoints / Fortsetzen über resume_state)."""
+        return {'times': list(self._times), 'scores': list(self._scores)}
+
+    def set_state(self, state):
+        self._times = list(state['times'])
+        self._scores = list(state['scores'])
+        self._max_gap = max((later - earlier for earlier, later in zip(self._times, self._times[1:])), default=0.0)
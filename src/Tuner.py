@@ -0,0 +1,195 @@
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+
+from ExperimentRunner import make_job, run_jobs
+from VNS import DEFAULT_PARAMS
+
+# Suchraum der Parameteranalyse im Notebook (Grid Search, 64 Kombinationen)
+PARAMETER_SPACE = {
+    'shaking_intensity_divisor': [20, 5],
+    'restart_stagnation': [10, 50],
+    'remove_var_min_pct': [5, 25],
+    'remove_var_max_pct': [35, 55],
+    'max_pool_size': [5, 15],
+    'repair_shaking': [True, False],
+}
+
+
+def is_valid_config(config):
+    """Kombinationen mit remove_var_min_pct >= remove_var_max_pct werden (wie im Notebook) übersprungen."""
+    return config.get('remove_var_min_pct', 0) < config.get('remove_var_max_pct', 100)
+
+
+def candidate_configs(space, n_configs=None, rnd=None):
+    """
+    Alle gültigen Kombinationen des Suchraums (Dict Parameter -> Liste von Werten).
+    n_configs: höchstens so viele Kombinationen, zufällig gezogen mit `rnd` (für große Räume)
+    """
+    names = sorted(space)
+    configs = [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+    configs = [config for config in configs if is_valid_config(config)]
+    if n_configs is not None and n_configs < len(configs):
+        configs = (rnd or random.Random(0)).sample(configs, n_configs)
+    return configs
+
+
+def budget_schedule(n_configs, max_time, eta=3, min_time=1.0):
+    """
+    Successive Halving: Runden als Liste (Anzahl Konfigurationen, Zeitbudget pro Lauf).
+    Nach jeder Runde überlebt 1/eta der Konfigurationen, das Budget wächst um den Faktor eta.
+    Die letzte Runde (mindestens zwei Konfigurationen, sofern vorhanden) läuft mit dem vollen Budget `max_time`.
+    """
+    sizes = [n_configs]
+    while sizes[-1] > 2:
+        sizes.append(math.ceil(sizes[-1] / eta))
+    rounds = len(sizes)
+    return [(size, max(min_time, max_time / eta ** (rounds - 1 - r))) for r, size in enumerate(sizes)]
+
+
+def _average_ranks(values):
+    """Ränge 1..n (kleiner Wert = Rang 1), Gleichstände bekommen den mittleren Rang (wie beim Friedman-Test)."""
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+def rank_configs(results, blocks):
+    """
+    Bewertet Konfigurationen über alle Blöcke (Instanz, Seed) wie beim F-Race: pro Block Ränge nach Score (höher ist besser)
+    und bei gleichem Score nach Distanz. Fehlgeschlagene Läufe bekommen den schlechtesten Rang.
+    results: Konfigurations-Index -> {Block: Ergebniszeile}
+    Rückgabe: Liste von (Index, mittlerer Rang, mittlere relative Lücke zum Blockbesten), beste zuerst
+    """
+    indices = list(results)
+    rank_sums = dict.fromkeys(indices, 0.0)
+    gap_sums = dict.fromkeys(indices, 0.0)
+    for block in blocks:
+        rows = [results[i].get(block) for i in indices]
+        keys = [(-row['score'], row['distance']) if row and row.get('status') == 'ok' else (float('inf'), float('inf'))
+                for row in rows]
+        best_score = max((row['score'] for row in rows if row and row.get('status') == 'ok'), default=0)
+        for i, rank, row in zip(indices, _average_ranks(keys), rows):
+            rank_sums[i] += rank
+            ok = row and row.get('status') == 'ok'
+            gap_sums[i] += (best_score - row['score']) / best_score if ok and best_score > 0 else (0.0 if ok else 1.0)
+    count = max(1, len(blocks))
+    ranking = [(i, rank_sums[i] / count, gap_sums[i] / count) for i in indices]
+    return sorted(ranking, key=lambda entry: (entry[1], entry[2], entry[0]))
+
+
+def race(instances, space=None, seeds=(1, 2), max_time=180, eta=3, min_time=1.0, n_configs=None, seed=0,
+         base_params=None, output_path='tuning.jsonl', max_workers=None, verbose=True):
+    """
+    Parametertuning per Successive Halving statt vollständiger Grid Search.
+    Jede Runde rechnet alle überlebenden Konfigurationen auf allen Instanzen x Seeds mit dem Budget der Runde (budget_schedule)
+    und behält das beste 1/eta nach mittlerem Rang (rank_configs). Nur die letzten Konfigurationen laufen mit vollem max_time.
+
+    Alle Läufe gehen über ExperimentRunner.run_jobs (Prozesspool, JSON Lines in `output_path`):
+    ein abgebrochenes Tuning wird mit derselben Ausgabedatei fortgesetzt, fertige Läufe werden nicht wiederholt.
+    Die Seeds sind für alle Konfigurationen gleich (gleiche Startlösungen), die Vergleiche damit gepaart.
+
+    Rückgabe: Dict mit 'best' (gewählte Parameter), 'defaults' (DEFAULT_PARAMS mit den gewählten Werten, für run_vns),
+    'rounds' (Verlauf) und den Aufwand: 'runs', 'cpu_seconds' (gemessene CPU-Zeit der Läufe), 'budget_seconds' (Summe der
+    Zeitbudgets aller Läufe) und zum Vergleich 'grid_budget_seconds' (Summe der Zeitbudgets einer vollständigen Grid Search)
+    """
+    space = space or PARAMETER_SPACE
+    base = dict(DEFAULT_PARAMS)
+    base.update(base_params or {})
+    configs = candidate_configs(space, n_configs, random.Random(seed))
+    if not configs:
+        raise ValueError("Der Suchraum enthält keine gültige Konfiguration.")
+    blocks = [(instance_path, s) for instance_path in instances for s in seeds]
+    schedule = budget_schedule(len(configs), max_time, eta, min_time)
+
+    survivors = list(range(len(configs)))
+    rounds = []
+    runs, cpu_seconds, budget_seconds = 0, 0.0, 0.0
+    for number, (_, budget) in enumerate(schedule, start=1):
+        if verbose:
+            print(f"Runde {number}/{len(schedule)}: {len(survivors)} Konfigurationen x {len(blocks)} Läufe mit je {budget:.1f} s")
+        jobs, keys = [], []
+        for i in survivors:
+            params = dict(base)
+            params.update(configs[i])
+            params['max_time'] = budget
+            for instance_path, s in blocks:
+                jobs.append(make_job('tuning', instance_path, s, params, dict(configs[i], max_time=budget)))
+                keys.append((i, (instance_path, s)))
+        rows = run_jobs(jobs, output_path, max_workers, verbose)
+
+        results = {i: {} for i in survivors}
+        for job, (i, block) in zip(jobs, keys):
+            row = rows.get(job['job_id'])
+            if row is not None:
+                results[i][block] = row
+                runs += 1
+                cpu_seconds += row.get('cpu_seconds', 0.0)
+                budget_seconds += budget
+        ranking = rank_configs(results, blocks)
+        keep = max(1, math.ceil(len(survivors) / eta)) if number < len(schedule) else 1
+        survivors = [i for i, _, _ in ranking[:keep]]
+        rounds.append({
+            'budget': budget,
+            'ranking': [{'config': configs[i], 'mean_rank': rank, 'mean_gap': gap} for i, rank, gap in ranking],
+            'survivors': [configs[i] for i in survivors],
+        })
+        if verbose:
+            for i, rank, gap in ranking[:keep]:
+                print(f"  weiter: {configs[i]} (mittlerer Rang {rank:.2f}, Lücke {gap:.2%})")
+
+    best = configs[survivors[0]]
+    defaults = dict(DEFAULT_PARAMS)
+    defaults.update(best)
+    return {'best': best, 'defaults': defaults, 'rounds': rounds, 'runs': runs, 'cpu_seconds': cpu_seconds,
+            'budget_seconds': budget_seconds, 'grid_budget_seconds': len(configs) * len(blocks) * max_time}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parametertuning der VNS per Successive Halving (Racing) statt Grid Search.")
+    parser.add_argument('instances', nargs='+', help="Instanzdateien")
+    parser.add_argument('--space', help="Suchraum als JSON (Parameter -> Liste von Werten), Standard: Grid des Notebooks")
+    parser.add_argument('--seeds', type=int, nargs='+', default=[1, 2])
+    parser.add_argument('--max-time', type=float, default=180, help="Volles Zeitbudget pro Lauf (letzte Runde)")
+    parser.add_argument('--min-time', type=float, default=1.0, help="Untergrenze für das Budget der ersten Runde")
+    parser.add_argument('--eta', type=int, default=3, help="Pro Runde überlebt 1/eta der Konfigurationen")
+    parser.add_argument('--configs', type=int, help="Höchstens so viele zufällig gezogene Kombinationen")
+    parser.add_argument('--seed', type=int, default=0, help="Seed für die Auswahl der Kombinationen")
+    parser.add_argument('--output', default='tuning.jsonl', help="Ergebnisdatei aller Läufe (JSON Lines, zum Fortsetzen)")
+    parser.add_argument('--workers', type=int, help="Anzahl Prozesse (Standard: alle Kerne)")
+    parser.add_argument('--write-defaults', help="Gewählte Standardparameter als JSON schreiben")
+    args = parser.parse_args(argv)
+
+    space = None
+    if args.space:
+        with open(args.space, 'r', encoding='utf-8') as file:
+            space = json.load(file)
+    result = race(args.instances, space, args.seeds, args.max_time, args.eta, args.min_time, args.configs, args.seed,
+                  output_path=args.output, max_workers=args.workers)
+    print(f"\nGewählt: {result['best']}")
+    print(f"Aufwand: {result['runs']} Läufe, {result['cpu_seconds']:.0f} s CPU, Zeitbudget {result['budget_seconds']:.0f} s "
+          f"(vollständige Grid Search: Zeitbudget {result['grid_budget_seconds']:.0f} s)")
+    print("DEFAULT_PARAMS = " + json.dumps(result['defaults'], indent=4).replace('true', 'True').replace('false', 'False'))
+    if args.write_defaults:
+        directory = os.path.dirname(args.write_defaults)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.write_defaults, 'w', encoding='utf-8') as file:
+            json.dump(result['defaults'], file, indent=4)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,50 +1,156 @@
+import os
 import time
 import random
 from Neighborhood import NeighborhoodGenerator
 from ConstructiveHeuristic import generate_solution
 from OutputData import TourSolution
+from LocalOptimaRegistry import LocalOptimaRegistry
+from SolutionPool import SolutionPool, node_bitset, bitset_similarity, pool_key
+from Deadline import Deadline, EvaluationBudget
+from Checkpoint import save_checkpoint, load_checkpoint, capture_state, check_instance
+from Bounds import compute_upper_bound, optimality_gap
+from AdaptiveSelection import AdaptiveOperatorSelector, improvement_gain
+from OperatorStats import OperatorStats
+from ConvergenceTrace import ConvergenceTrace, EVENT_NEW_BEST, EVENT_RESTART
+from Profiling import RunProfiler, no_phase
+from StoppingRule import ConvergenceStopper
+from EliteArchive import EliteArchive
 
 def similarity(tour_a, tour_b):
     """
     Berechnet die (Jaccard) Ähnlichkeit zwischen zwei Touren.
     Die Ähnlichkeit ist definiert als der Anteil der gemeinsamen Knoten (ohne Depot) im Verhältnis zur Gesamtmenge der besuchten Knoten.
     Ein Wert von 1.0 bedeutet identische Knotensets / 0.0 bedeutet keine gemeinsamen Knoten.
-    Wird verwendet für den ListenAbgleich (Solution Pool)
+    Wird verwendet für den ListenAbgleich (Solution Pool) / Der Pool selbst rechnet direkt auf gespeicherten Bitsets (siehe SolutionPool.py)
     """
-    set_a = set(tour_a[1:-1])
-    set_b = set(tour_b[1:-1])
-    union_size = len(set_a | set_b)
-    if union_size == 0: return 1.0
-    return len(set_a & set_b) / union_size
+    return bitset_similarity(node_bitset(tour_a), node_bitset(tour_b))
+
+# Bewährte Standardparameter (Gewählt aus Parameteranalyse / die meisten zumimindest)
+DEFAULT_PARAMS = {
+    'max_pool_size': 12,
+    'similarity_threshold': 0.85,
+    'pool_score_ratio': 0.85,
+    'restart_stagnation': 60,
+    'vns_stagnation_limit': 120,
+    'max_time': 180,
+    'shaking_intensity_divisor': 5,
+    'remove_var_min_pct': 25,
+    'remove_var_max_pct': 35,
+    # Held-Karp-Neusortierung (HeldKarp.py) ist optional / z. B. 12 schaltet sie für Touren bis 12 Kunden ein
+    'held_karp_max_nodes': 0,
+    # Gebündelte Bewertung mit NumPy ist optional (gleiche Züge) / derselbe Standard wie in iterate_vns_parametrized
+    'batched_evaluation': False,
+}
+
+class VNSProgress:
+    """
+    Zwischenergebnis der VNS, das bei jeder neuen global besten Lösung geliefert wird (siehe iterate_vns_parametrized).
+    solution: die neue beste TourSolution
+    elapsed: Sekunden seit dem globalen Startzeitpunkt
+    iteration: Nummer der VNS-Iteration, in der die Lösung gefunden wurde
+    restarts: Anzahl der Restarts bis dahin
+    """
+    def __init__(self, solution, elapsed, iteration, restarts=0):
+        self.solution = solution
+        self.elapsed = elapsed
+        self.iteration = iteration
+        self.restarts = restarts
+
+    def __repr__(self):
+        return (f"VNSProgress(score={self.solution.score}, distance={self.solution.total_distance:.2f}, "
+                f"elapsed={self.elapsed:.2f}, iteration={self.iteration})")
 
-def run_vns(input_data, start_solution, seed=None, rnd=None, global_start_time=None, verbose=True):
+def run_vns(input_data, start_solution, seed=None, rnd=None, global_start_time=None, verbose=True, deadline=None, run_info=None, elite_archive=None):
     """
     Wrapper für die VNS.
     Diese Funktion ist der Einstiegspunkt.
     Sie ruft die eigentliche, parametrisierbare VNS-Funktion mit bewährten Standardparametern auf (Gewählt aus Parameteranalyse / die meisten zumimindest).
+    elite_archive: Optionaler Ordner des Elite-Archivs (EliteArchive.py), Pool und Startpunkt kommen dann aus früheren Läufen.
+    """
+    if rnd is None:
+        rnd = random.Random(seed)
+    if global_start_time is None:
+        global_start_time = time.time()
+    params = dict(DEFAULT_PARAMS)
+    if elite_archive is not None:
+        params['elite_archive'] = elite_archive
+
+    return run_vns_parametrized(input_data, start_solution, rnd, params, global_start_time, verbose, deadline=deadline, run_info=run_info)
+
+def iterate_vns(input_data, start_solution, seed=None, rnd=None, global_start_time=None, verbose=False, deadline=None, run_info=None, elite_archive=None):
+    """
+    Anytime-Variante von `run_vns` mit denselben Standardparametern und Argumenten.
+    Liefert als Generator jede neue global beste Lösung als VNSProgress, sobald sie gefunden wurde.
+    Der Aufrufer kann jederzeit aufhören zu iterieren (z. B. eigenes Latenzlimit), die VNS wird dann sauber beendet.
+    elite_archive: wie bei `run_vns` / ein Warmstart aus dem Archiv wird ebenfalls als VNSProgress geliefert.
     """
     if rnd is None:
         rnd = random.Random(seed)
     if global_start_time is None:
         global_start_time = time.time()
+    params = dict(DEFAULT_PARAMS)
+    if elite_archive is not None:
+        params['elite_archive'] = elite_archive
+
+    return iterate_vns_parametrized(input_data, start_solution, rnd, params, global_start_time, verbose, deadline=deadline, run_info=run_info)
 
-    default_params = {
-        'max_pool_size': 12,
-        'similarity_threshold': 0.85,
-        'pool_score_ratio': 0.85,
-        'restart_stagnation': 60,
-        'vns_stagnation_limit': 120,
-        'max_time': 180,
-        'shaking_intensity_divisor': 5,
-        'remove_var_min_pct': 25,
-        'remove_var_max_pct': 35,
-    }
-    return run_vns_parametrized(input_data, start_solution, rnd, default_params, global_start_time, verbose)
-
-def run_vns_parametrized(input_data, start_solution, rnd, params, global_start_time, verbose=True):
+def run_vns_parametrized(input_data, start_solution, rnd, params, global_start_time, verbose=True, deadline=None, run_info=None, profiler=None):
     """
-    Führt die Kernlogik der Variable Neighborhood Search (VNS) aus.
+    Führt die Kernlogik der Variable Neighborhood Search (VNS) aus und gibt die beste gefundene Lösung zurück.
     Diese Funktion ist hochgradig parametrisierbar, um Analysen zu ermöglichen. / Wurde sehr häufig umstrukturiert für die ParameterAnalyse / Für ältere Versionen siehe weiter unten
+    Die eigentliche Suche steckt in `iterate_vns_parametrized`, hier wird sie nur bis zum Ende durchlaufen.
+
+    deadline: Optionales Deadline-Objekt (Deadline.py). Ohne Angabe wird es aus `global_start_time` und `max_time` erzeugt,
+              mit Parameter 'max_evaluations' stattdessen ein EvaluationBudget (rechnerunabhängig reproduzierbar).
+              Es wird bis in die Operatoren durchgereicht, damit auch ein einzelner langer Operator das Zeitlimit nicht weit überschreitet.
+    run_info: Optionales Dictionary, das mit Kennzahlen des Laufs gefüllt wird (z. B. gemessene Überschreitung des Zeitlimits).
+    profiler: Optionaler RunProfiler (Profiling.py), in dem Shaking, VND und Pool als Phasen gemessen werden.
+              Ohne Angabe wird über den Parameter 'profile' oder die Umgebungsvariable VNS_PROFILE entschieden.
+    """
+    best = start_solution
+    for progress in iterate_vns_parametrized(input_data, start_solution, rnd, params, global_start_time, verbose, deadline=deadline, run_info=run_info, profiler=profiler):
+        best = progress.solution
+    return best
+
+def resume_vns(input_data, checkpoint_path, verbose=True, deadline=None, run_info=None):
+    """
+    Setzt einen abgebrochenen Lauf aus einem Checkpoint fort (siehe Parameter 'checkpoint_path').
+    Zustand, Pool, Zähler und der Zufallsgenerator werden exakt wiederhergestellt, die Suche läuft also genauso weiter,
+    als wäre sie nie unterbrochen worden. Das Zeitbudget `max_time` zählt über beide Läufe zusammen.
+    Der Checkpoint wird weiterhin unter demselben Pfad fortgeschrieben.
+    """
+    state = load_checkpoint(checkpoint_path)
+    check_instance(state, input_data)
+    params = dict(state['params'])
+    params['checkpoint_path'] = checkpoint_path
+
+    rnd = random.Random()
+    start_solution = _restore_solution(state['start_tour'], input_data)
+    if deadline is None and params.get('max_evaluations') is not None:
+        deadline = EvaluationBudget(max(0, params['max_evaluations'] - state['counters'].get('evaluations', 0)))
+    elif deadline is None:
+        deadline = Deadline(max(0.0, params.get('max_time', 180) - state['elapsed']),
+                            check_every=params.get('deadline_check_every', 64))
+    best = _restore_solution(state['best'], input_data)
+    if verbose:
+        print(f"Setze VNS fort nach {state['counters']['iteration']} Iterationen ({state['elapsed']:.1f} s) | Bester Score bisher: {best.score}")
+
+    for progress in iterate_vns_parametrized(input_data, start_solution, rnd, params, time.time(), verbose, deadline=deadline, run_info=run_info, resume_state=state):
+        best = progress.solution
+    return best
+
+def _restore_solution(tour, input_data):
+    """Baut aus einer gespeicherten Tour wieder eine bewertete TourSolution."""
+    solution = TourSolution(tour, input_data.time_limit)
+    solution.evaluate(input_data)
+    return solution
+
+def iterate_vns_parametrized(input_data, start_solution, rnd, params, global_start_time, verbose=True, deadline=None, run_info=None, resume_state=None, profiler=None):
+    """
+    Generator-Version der VNS (gleiche Parameter wie `run_vns_parametrized`).
+    Liefert bei jeder neuen global besten Lösung ein VNSProgress-Objekt (Lösung, verstrichene Zeit, Iteration).
+    Die Startlösung selbst wird nicht geliefert. Wird der Generator vorzeitig geschlossen, endet die Suche an dieser Stelle.
+    resume_state: Zustand aus einem Checkpoint (siehe Checkpoint.py), ab dem die Suche fortgesetzt wird.
     """
     # === 1. Parameter und Initialisierung ===
     # Die Parameter werden aus dem übergebenen Dictionary ausgelesen.
@@ -55,10 +161,66 @@ def run_vns_parametrized(input_data, start_solution, rnd, params, global_start_t
     restart_stagnation = params.get('restart_stagnation', 50)
     vns_stagnation_limit = params.get('vns_stagnation_limit', 100)
     max_time = params.get('max_time', 180)
+    # Budget in Nachbar-Bewertungen statt Sekunden (Deadline.EvaluationBudget) / None = Zeitlimit max_time
+    max_evaluations = params.get('max_evaluations')
+    # Feste Anzahl an Iterationen (z. B. für Benchmarks, unabhängig von der Rechnergeschwindigkeit) / None = unbegrenzt
+    max_iterations = params.get('max_iterations')
+    # Konvergenzabhängiger Abbruch (StoppingRule.py): Schwelle für den erwarteten relativen Gewinn pro Sekunde / None = aus
+    stop_gain_rate = params.get('stop_gain_rate')
+    stop_window = params.get('stop_window', 5)
+    stop_patience = params.get('stop_patience', 2.0)
+    stop_min_time = params.get('stop_min_time', 10.0)
     shaking_intensity_divisor = params.get('shaking_intensity_divisor', 15)
     remove_var_min_pct = params.get('remove_var_min_pct', 10)
     remove_var_max_pct = params.get('remove_var_max_pct', 30)
     repair_shaking = params.get('repair_shaking', False)
+    local_optima_cache_size = params.get('local_optima_cache_size', 5000)
+    held_karp_max_nodes = params.get('held_karp_max_nodes', 0)
+    # Einfüge-/Austausch-Nachbarschaften mit NumPy gebündelt bewerten (gleiche Züge, ohne NumPy automatisch die Schleifen)
+    batched_evaluation = params.get('batched_evaluation', False)
+    # Adaptive Operatorauswahl (ALNS-artig, siehe AdaptiveSelection.py) für Shaking-Operatoren und die Reihenfolge der VND
+    # 'adaptive_cost': 'evaluations' (reproduzierbar) oder 'cpu' (echte CPU-Sekunden)
+    adaptive_operators = params.get('adaptive_operators', False)
+    adaptive_decay = params.get('adaptive_decay', 0.8)
+    adaptive_min_share = params.get('adaptive_min_share', 0.1)
+    adaptive_cost = params.get('adaptive_cost', 'evaluations')
+    # Statistik pro Operator (Aufrufe, CPU-Zeit, bewertete Nachbarn, Verbesserungen) / landet in run_info['operator_stats']
+    collect_stats = params.get('collect_stats', False)
+    # Verlauf (Score über Zeit) in einem Ringpuffer mit 'trace_capacity' Einträgen / 0 = aus, 'trace_path' schreibt ihn am Ende als .csv.gz
+    trace_capacity = params.get('trace_capacity', 0)
+    trace_path = params.get('trace_path')
+    deadline_check_every = params.get('deadline_check_every', 64)
+    # Checkpoints: Pfad der Datei und Mindestabstand in Sekunden / ohne Pfad wird nichts geschrieben
+    checkpoint_path = params.get('checkpoint_path')
+    checkpoint_interval = params.get('checkpoint_interval', 5.0)
+    # Endzustand der Suche in run_info['state'] ablegen (Fortsetzen im Speicher über resume_state, z. B. BatchScheduler.py)
+    return_state = params.get('capture_state', False)
+    # Persistentes Elite-Archiv über Läufe hinweg (EliteArchive.py): Ordner / None = aus
+    # 'elite_warm_start': Pool und current aus dem Archiv füllen (sonst nur am Ende hineinschreiben)
+    elite_archive = params.get('elite_archive')
+    elite_archive_size = params.get('elite_archive_size', 20)
+    elite_warm_start = params.get('elite_warm_start', True)
+    # Obere Schranke für den Score (Bounds.py): Erreicht die beste Lösung sie, ist sie bewiesen optimal und die VNS hört auf
+    # Kann auch direkt vorgegeben werden (z. B. aus dem exakten Solver), 'use_upper_bound': False schaltet das ab
+    upper_bound = params.get('upper_bound')
+    if upper_bound is None and params.get('use_upper_bound', True):
+        upper_bound = compute_upper_bound(input_data)
+
+    # Zeitlimit über die monotone Uhr / Zählt ab dem globalen Startzeitpunkt (inkl. Startlösung aus dem Notebook)
+    if deadline is None and max_evaluations is not None:
+        # Ohne Blick auf die Uhr: gleiche Seeds ergeben auf jedem Rechner dieselbe Lösung
+        deadline = EvaluationBudget(max_evaluations)
+    elif deadline is None:
+        deadline = Deadline.from_wall_clock(global_start_time, max_time, check_every=deadline_check_every)
+
+    # Profiling pro Lauf ohne Codeänderung: Parameter 'profile' oder Umgebungsvariable VNS_PROFILE (siehe Profiling.py)
+    # Einen übergebenen Profiler startet/stoppt der Aufrufer (z. B. Solver.py für die ganze Pipeline)
+    owns_profiler = profiler is None
+    if owns_profiler:
+        profiler = RunProfiler.from_env(params.get('profile'), name=f"{input_data.name or 'vns'}-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}")
+        if profiler is not None:
+            profiler.start()
+    phase = profiler.phase if profiler is not None else no_phase
 
     # current ist die Lösung, von der aus gesucht wird. 
     current = start_solution
@@ -69,18 +231,44 @@ def run_vns_parametrized(input_data, start_solution, rnd, params, global_start_t
     # leider auch nicht herausgefunden wie man das am besten noch implementieren kann.
     
     # um bei Restarts auf vielversprechende, aber andere Startpunkte zurückgreifen zu können. / So die Theorie / Restarts gibt es bei Instance 4 und 5 aber leider kaum noch.
-    pool = [start_solution]
+    pool = SolutionPool(max_pool_size, similarity_threshold, pool_score_ratio)
+    pool.insert(start_solution)
+
+    # Warmstart aus dem Elite-Archiv (nicht beim Fortsetzen, da kommt der Pool aus dem Checkpoint)
+    # Die archivierten Lösungen kommen in den Pool, die beste wird Startpunkt, wenn sie die Startlösung schlägt
+    archive = EliteArchive(elite_archive, elite_archive_size, similarity_threshold) if elite_archive else None
+    warm_started = False
+    if archive is not None and elite_warm_start and resume_state is None:
+        archived = archive.load(input_data)
+        for solution in archived:
+            if solution.tour != start_solution.tour:
+                pool.insert(solution)
+        if archived and pool_key(archived[0]) > pool_key(best):
+            current = best = archived[0]
+            warm_started = True
+            if verbose:
+                print(f"Warmstart aus dem Elite-Archiv ({len(archived)} Lösungen): Score={best.score}, Distanz={best.total_distance:.2f}")
     
     # der NeighborhoodGenerator wird einmal erstellt. Sein interner Zustand 
     # (z.B. der no_improvement_counter für das Shaking) bleibt über den gesamten VNS-Lauf erhalten.
     # Dies ist entscheidend für adaptive Strategien. / Siehe Neighborhood.py  def random_modify ) 
     # Auch hier habe ich wegen der Parameteranalyse alles variable machen müssen / in älteren Versionen standen hier feste Werte
+    stats = OperatorStats() if collect_stats else None
+    shaking_selector = None
+    if adaptive_operators:
+        shaking_selector = AdaptiveOperatorSelector(NeighborhoodGenerator.SHAKING_OPERATORS, rnd, adaptive_decay,
+                                                    adaptive_min_share, adaptive_cost)
     ng = NeighborhoodGenerator(
         input_data, 
         rnd=rnd, 
         shaking_intensity_divisor=shaking_intensity_divisor,
         remove_var_min_pct=remove_var_min_pct,
-        remove_var_max_pct=remove_var_max_pct
+        remove_var_max_pct=remove_var_max_pct,
+        deadline=deadline,
+        held_karp_max_nodes=held_karp_max_nodes,
+        batched_evaluation=batched_evaluation,
+        shaking_selector=shaking_selector,
+        stats=stats
     )
 
     # Liste von local_search für das VND (Intensivierung).
@@ -90,116 +278,312 @@ def run_vns_parametrized(input_data, start_solution, rnd, params, global_start_t
         ng.replace_node,
         ng.segment_move
     ]
+    # Exakte Neusortierung kurzer Touren als letzte Nachbarschaft / Läuft nur, wenn alle anderen nichts mehr finden
+    if held_karp_max_nodes > 0:
+        local_search_methods.append(ng.held_karp_reorder)
+    local_search_names = [method.__name__ for method in local_search_methods]
+    vnd_selector = None
+    if adaptive_operators:
+        vnd_selector = AdaptiveOperatorSelector(local_search_names, rnd, adaptive_decay, adaptive_min_share, adaptive_cost)
+        methods_by_name = dict(zip(local_search_names, local_search_methods))
+    selectors = {'shaking': shaking_selector, 'vnd': vnd_selector} if adaptive_operators else None
+    # Aufwand der VND-Nachbarschaften nur messen, wenn adaptive Auswahl oder Statistik ihn brauchen
+    track_operators = adaptive_operators or collect_stats
+
+    # Gedächtnis für bereits bekannte lokale Optima / Spart die komplette VND, wenn eine geshakte Tour schon einmal optimiert wurde
+    # 0 schaltet das Gedächtnis ab (bei fester VND-Reihenfolge sind die Ergebnisse mit und ohne identisch, da die local search deterministisch ist)
+    # Mit adaptive_operators liefert ein Treffer dasselbe Optimum wie die VND in dieser Reihenfolge, die Gewichte lernen aber nur aus tatsächlich gelaufenen VNDs
+    # Welche VNDs laufen, hängt damit vom Gedächtnis ab / es gehört deshalb wie die Gewichte zum Checkpoint (sonst lernt ein fortgesetzter Lauf anders)
+    registry = LocalOptimaRegistry(local_optima_cache_size) if local_optima_cache_size > 0 else None
+    stopper = ConvergenceStopper(stop_gain_rate, stop_window, stop_patience, stop_min_time) if stop_gain_rate is not None else None
 
     k_shake = 0  # Index für die Shaking-Struktur (hier nicht direkt genutzt, aber Teil des VNS-Konzepts)
     stagnation_counter = 0 # Zählt Iterationen ohne Verbesserung der *global besten* Lösung. / Wird auch für Abbruch verwendet
     restarts = 0 # Wie häufig restartet wurde. Hab ich auch oft mit geloggt weil ich zwischen durch große Probleme hatte bei der reproduzierung und schauen wollte wieso das ganze 
+    iteration = 0 # Anzahl der durchlaufenen VNS-Iterationen (Shaking + VND)
+    elapsed_offset = 0.0 # Bereits verbrauchte Zeit vor einem Resume
+    evaluations_offset = 0 # Bereits verbrauchte Bewertungen vor einem Resume (nur mit Bewertungsbudget)
+
+    # Fortsetzen aus einem Checkpoint: kompletter Suchzustand inkl. Zufallsgenerator wird wiederhergestellt
+    if resume_state is not None:
+        check_instance(resume_state, input_data)
+        current = _restore_solution(resume_state['current'], input_data)
+        best = _restore_solution(resume_state['best'], input_data)
+        pool = SolutionPool(max_pool_size, similarity_threshold, pool_score_ratio)
+        for tour in resume_state['pool']:
+            pool.insert(_restore_solution(tour, input_data))
+        rnd.setstate(resume_state['random_state'])
+        counters = resume_state['counters']
+        k_shake = counters['k_shake']
+        stagnation_counter = counters['stagnation_counter']
+        restarts = counters['restarts']
+        iteration = counters['iteration']
+        ng.no_improvement_counter = counters['no_improvement_counter']
+        elapsed_offset = resume_state['elapsed']
+        evaluations_offset = counters.get('evaluations', 0)
+        if registry is not None and resume_state.get('registry'):
+            # Ohne das Gedächtnis würden übersprungene VNDs erneut laufen und Bewertungen/Gewichte anders verbraucht
+            registry.set_state(resume_state['registry'], input_data)
+        if selectors is not None and resume_state.get('selectors'):
+            for name, selector in selectors.items():
+                selector.set_state(resume_state['selectors'][name])
+        if stopper is not None and counters.get('convergence'):
+            stopper.set_state(counters['convergence'])
+
+    def current_state():
+        """Aktueller Suchzustand als Daten (siehe Checkpoint.capture_state)."""
+        counters = {
+            'k_shake': k_shake,
+            'stagnation_counter': stagnation_counter,
+            'restarts': restarts,
+            'iteration': iteration,
+            'no_improvement_counter': ng.no_improvement_counter,
+        }
+        if stopper is not None:
+            counters['convergence'] = stopper.get_state()
+        if isinstance(deadline, EvaluationBudget):
+            counters['evaluations'] = evaluations_offset + deadline.evaluations
+        return capture_state(input_data, params, start_solution, current, best, pool, rnd, counters, elapsed_offset + deadline.elapsed(),
+                             selectors={name: selector.get_state() for name, selector in selectors.items()} if selectors else None,
+                             registry=registry.get_state() if registry is not None else None)
+
+    def write_checkpoint():
+        """Schreibt den aktuellen Suchzustand (nur an Iterationsgrenzen, damit das Fortsetzen exakt ist)."""
+        save_checkpoint(checkpoint_path, current_state())
+    last_checkpoint = time.monotonic()
+    if stopper is not None:
+        stopper.start(elapsed_offset + deadline.elapsed(), best.score)
+
+    trace = ConvergenceTrace(trace_capacity) if trace_capacity > 0 else None
+    if trace is not None:
+        trace.record(elapsed_offset + deadline.elapsed(), iteration, current, best, len(pool))
     
-    #  Hilfsfunktionen für den Pool 
+    #  Hilfsfunktionen für den Pool / Die eigentliche Logik (Bitsets, sortiertes Einfügen) steckt in SolutionPool.py
     def add_to_pool(candidate):
         """Fügt eine Kandidatenlösung zum Pool hinzu, wenn sie gut und divers genug ist."""
-        # Ignoriere Lösungen die deutlich schlechter sind als die bisher beste
-        if best.score > 0 and candidate.score < pool_score_ratio * best.score: return
-        
-        # Ignoriere Lösungen, die zu ähnlich zu bereits im Pool vorhandenen sind / Hier greift wieder def similarity von oben
-        is_too_similar = False
-        for sol in pool:
-            if similarity(sol.tour, candidate.tour) > similarity_threshold:
-                is_too_similar = True
-                break
-        
-        if not is_too_similar:
-            pool.append(candidate)
-            # Deterministisches Sortieren, um Reproduzierbarkeit zu gewährleisten. (Hat mir Chat GPT nach einer Weile als mögliches Problem der fehlenden Reproduzierbarkeit vorgeschlagen)
-            # Kriterien: 1. Score (hoch), 2. Distanz (niedrig), 3. Tour-Inhalt (eindeutig). / Danach wird Sotiert um jedes mal deterministische Listen = Lösungen/Scores zu erhalten 
-            pool.sort(key=lambda s: (s.score, -s.total_distance, tuple(s.tour)), reverse=True)
-            if len(pool) > max_pool_size:
-                pool.pop() # Entferne die schlechteste Lösung, wenn der Pool voll ist. / Pool wird begrenz da sonst die random auswahl an Lösungen bei Neustart zu ineffizient wäre und auch schlechtere Lösunge wählen kann/ oder welche die schonmal genutzt worden sind
+        with phase('pool'):
+            pool.try_add(candidate, best)
 
     def select_from_pool():
         """Wählt eine Lösung aus dem Pool. Bevorzugt Lösungen, die unähnlicher zur besten Lösung sind um diversität zu erzeugen"""
-        if not pool: return best
-        if len(pool) == 1: return pool[0]
-        
-        max_score = max(sol.score for sol in pool) if pool else 1
-        if max_score == 0: max_score = 1
+        with phase('pool'):
+            return pool.select(rnd, best)
         
-        # Gewichtung kombiniert Diversität (Unähnlichkeit zu `best`) und Qualität (Score).
-        weights = [(1 - similarity(sol.tour, best.tour)) * 0.5 + (sol.score / max_score) * 0.5 for sol in pool]
-        return rnd.choices(pool, weights=weights, k=1)[0]
+    # try/finally: Auch wenn der Aufrufer den Generator vorzeitig schließt, wird der Lauf sauber abgeschlossen (run_info, Log)
+    try:
+        if warm_started:
+            # Die archivierte Lösung ist besser als die Startlösung / auch sie wird als neue beste Lösung geliefert
+            yield VNSProgress(best, elapsed_offset + deadline.elapsed(), iteration, restarts)
+
+        # === 2. VNS-Hauptschleife ===
+        # Läuft, solange das Zeitlimit und das Stagnationslimit nicht erreicht sind / Sonst abbruch 
+        while not deadline.expired() and stagnation_counter < vns_stagnation_limit \
+                and (upper_bound is None or best.score < upper_bound) \
+                and (max_iterations is None or iteration < max_iterations) \
+                and (stopper is None or not stopper.should_stop(elapsed_offset + deadline.elapsed())):
         
-    # === 2. VNS-Hauptschleife ===
-    # Läuft, solange das Zeitlimit und das Stagnationslimit nicht erreicht sind / Sonst abbruch 
-    while time.time() - global_start_time < max_time and stagnation_counter < vns_stagnation_limit:
+            # Schritt 1: Shaking (Störung)
+            # Stört die *aktuelle* Lösung (`current`), um aus lokalen Optimum zu entkommen und mögliche Nachbarschaften/globale Optima zu erkunden
+            # Die Intensität des Shakings wird durch `ng.no_improvement_counter` gesteuert in def random_modify in Neighborhood.py
+            iteration += 1
+            event = 0
+            with phase('shaking'):
+                shaken = ng.shaking(current, k_shake, repair=repair_shaking)
         
-        # Schritt 1: Shaking (Störung)
-        # Stört die *aktuelle* Lösung (`current`), um aus lokalen Optimum zu entkommen und mögliche Nachbarschaften/globale Optima zu erkunden
-        # Die Intensität des Shakings wird durch `ng.no_improvement_counter` gesteuert in def random_modify in Neighborhood.py
-        shaken = ng.shaking(current, k_shake, repair=repair_shaking)
+            # Zusätzliche Zeitchecks an rechenintensiven Stellen für das einhalten Zeitlimit (3 min pro Instance)
+            if deadline.expired(): break
         
-        # Zusätzliche Zeitchecks an rechenintensiven Stellen für das einhalten Zeitlimit (3 min pro Instance)
-        if time.time() - global_start_time >= max_time: break
+            # Schritt 2: Lokale Suche (Variable Neighborhood Descent - VND) (In Aufgaben Stellung Empfohlen gewesen)
+            # Eine intensive lokale Suche die versucht die gestörte Lösung so gut wie möglich zu verbessern
+            with phase('vnd'):
+                local_best = shaken
+                vnd_methods, vnd_names = local_search_methods, local_search_names
+                if vnd_selector is not None:
+                    # Reihenfolge der Nachbarschaften für diese Iteration per Roulette / erfolgreiche, billige Nachbarschaften zuerst
+                    vnd_names = vnd_selector.order()
+                    vnd_methods = [methods_by_name[name] for name in vnd_names]
+                if track_operators:
+                    vnd_start_evaluations, vnd_start_time = ng.evaluations, time.process_time()
+                # Bei adaptiver Reihenfolge hängt das erreichte Optimum von der Reihenfolge ab / Schlüssel inkl. Reihenfolge
+                vnd_order = vnd_names if vnd_selector is not None else None
+                known_optimum = registry.lookup(shaken.tour, vnd_order) if registry is not None else None
+                if known_optimum is not None:
+                    # Diese Tour wurde schon einmal bis ins lokale Optimum getrieben / VND kann übersprungen werden
+                    local_best = known_optimum
+                else:
+                    k_vnd = 0
+                    vnd_complete = True
+                    while k_vnd < len(vnd_methods):
+                        if deadline.expired():
+                            vnd_complete = False
+                            break
+                
+                        # Nachbarschaft wurde für genau diese Tour schon ohne Verbesserung durchsucht
+                        if registry is not None and registry.is_non_improving(local_best.tour, vnd_names[k_vnd]):
+                            if stats is not None:
+                                stats.skip('vnd', vnd_names[k_vnd])
+                            k_vnd += 1
+                            continue
+
+                        method = vnd_methods[k_vnd]
+                        if track_operators:
+                            start_evaluations, start_time = ng.evaluations, time.process_time()
+                        improved = method(local_best)
+                        if track_operators:
+                            evaluations, seconds = ng.evaluations - start_evaluations, time.process_time() - start_time
+                            gain = improvement_gain(improved, local_best, input_data.time_limit)
+                            if vnd_selector is not None:
+                                vnd_selector.update(vnd_names[k_vnd], gain, vnd_selector.cost(evaluations, seconds))
+                            if stats is not None:
+                                stats.record('vnd', vnd_names[k_vnd], seconds, evaluations, gain)
+                        # Wurde der Operator durch die Deadline unterbrochen, ist sein Ergebnis nur "best-so-far" und kein Beweis für ein lokales Optimum
+                        interrupted = deadline.expired()
+
+                        # Wenn eine Verbesserung gefunden wurde, beginne die VND von vorne mit der ersten Nachbarschaft
+                        # Dies ist eine "First Improvement"-Strategie auf Ebene der Nachbarschaftsstrukturen
+                        if improved.score > local_best.score or \
+                          (improved.score == local_best.score and improved.total_distance < local_best.total_distance):
+                            local_best = improved
+                            k_vnd = 0
+                        else:
+                            if registry is not None and not interrupted:
+                                registry.mark_non_improving(local_best.tour, vnd_names[k_vnd])
+                            k_vnd += 1
+                        if interrupted:
+                            vnd_complete = False
+                            break
+
+                    # Nur eine komplett durchlaufene VND liefert ein echtes lokales Optimum (nicht bei Abbruch durch das Zeitlimit)
+                    if registry is not None and vnd_complete:
+                        registry.record(shaken.tour, local_best, local_search_names, vnd_order)
+
+            if track_operators and ng.last_shaking_ops:
+                # Gewinn der ganzen Iteration (Shaking + VND gegenüber current) geht an die angewendeten Shaking-Operatoren
+                # Kosten: eigener Aufwand plus ein gleicher Anteil der anschließenden VND
+                gain = improvement_gain(local_best, current, input_data.time_limit)
+                share = len(ng.last_shaking_ops)
+                vnd_evaluations = (ng.evaluations - vnd_start_evaluations) / share
+                vnd_seconds = (time.process_time() - vnd_start_time) / share
+                for op, evaluations, seconds in ng.last_shaking_ops:
+                    if shaking_selector is not None:
+                        shaking_selector.update(op, gain, shaking_selector.cost(evaluations + vnd_evaluations, seconds + vnd_seconds))
+                    if stats is not None:
+                        stats.credit('shaking', op, gain)
         
-        # Schritt 2: Lokale Suche (Variable Neighborhood Descent - VND) (In Aufgaben Stellung Empfohlen gewesen)
-        # Eine intensive lokale Suche die versucht die gestörte Lösung so gut wie möglich zu verbessern
-        local_best = shaken
-        k_vnd = 0
-        while k_vnd < len(local_search_methods):
-            if k_vnd % 2 == 0 and time.time() - global_start_time >= max_time: break
+            # Schritt 3 Entscheidung (Move or Not)
+            # Vergleiche das Ergebnis der lokalen Suche `local_best` mit der Lösung *vor* dem Shaking `current`
+            if local_best.score > current.score or \
+               (local_best.score == current.score and local_best.total_distance < local_best.total_distance):
+                # Akzeptiere die neue Lösung
+                current = local_best
+                stagnation_counter = 0 # Reset da eine bessere Lösung gefunden wurde
+
+                # Prüfe, ob sie auch die global beste Lösung ist
+                if current.score > best.score or \
+                   (current.score == best.score and current.total_distance < best.total_distance):
+                    best = current
+                    event |= EVENT_NEW_BEST
+                    if stopper is not None:
+                        stopper.improved(elapsed_offset + deadline.elapsed(), best.score)
+                    if verbose:
+                        print(f"Neue beste Lösung gefunden: Score={best.score}, Distanz={best.total_distance:.2f}")
+                        print(f"   Tour: {best.tour}")
+                    yield VNSProgress(best, elapsed_offset + deadline.elapsed(), iteration, restarts)
             
-            method = local_search_methods[k_vnd]
-            improved = method(local_best)
-
-            # Wenn eine Verbesserung gefunden wurde, beginne die VND von vorne mit der ersten Nachbarschaft
-            # Dies ist eine "First Improvement"-Strategie auf Ebene der Nachbarschaftsstrukturen
-            if improved.score > local_best.score or \
-              (improved.score == local_best.score and improved.total_distance < local_best.total_distance):
-                local_best = improved
-                k_vnd = 0
+                add_to_pool(current)
+                ng.no_improvement_counter = 0 # Reset des Shaking-Zählers
+                k_shake = 0
             else:
-                k_vnd += 1
-        
-        # Schritt 3 Entscheidung (Move or Not)
-        # Vergleiche das Ergebnis der lokalen Suche `local_best` mit der Lösung *vor* dem Shaking `current`
-        if local_best.score > current.score or \
-           (local_best.score == current.score and local_best.total_distance < local_best.total_distance):
-            # Akzeptiere die neue Lösung
-            current = local_best
-            stagnation_counter = 0 # Reset da eine bessere Lösung gefunden wurde
-
-            # Prüfe, ob sie auch die global beste Lösung ist
-            if current.score > best.score or \
-               (current.score == best.score and current.total_distance < best.total_distance):
-                best = current
+                # Keine Verbesserung = erhöhe die Zähler
+                stagnation_counter += 1
+                ng.no_improvement_counter += 1
+                k_shake = (k_shake + 1) % 4 # (hier nicht direkt genutzt, aber VNS-"Standard")
+
+            # Schritt 4: Restart-Strategie
+            # Wenn der Algorithmus zu lange keine Verbesserung für `current` findet wird ein Restart ausgelöst, um Stagnation zu durchbrechen/ diverstiät zu ermöglichen
+            if ng.no_improvement_counter > restart_stagnation:
+                restarts += 1
+                event |= EVENT_RESTART
                 if verbose:
-                    print(f"Neue beste Lösung gefunden: Score={best.score}, Distanz={best.total_distance:.2f}")
-                    print(f"   Tour: {best.tour}")
-            
-            add_to_pool(current)
-            ng.no_improvement_counter = 0 # Reset des Shaking-Zählers
-            k_shake = 0
-        else:
-            # Keine Verbesserung = erhöhe die Zähler
-            stagnation_counter += 1
-            ng.no_improvement_counter += 1
-            k_shake = (k_shake + 1) % 4 # (hier nicht direkt genutzt, aber VNS-"Standard")
-
-        # Schritt 4: Restart-Strategie
-        # Wenn der Algorithmus zu lange keine Verbesserung für `current` findet wird ein Restart ausgelöst, um Stagnation zu durchbrechen/ diverstiät zu ermöglichen
-        if ng.no_improvement_counter > restart_stagnation:
-            restarts += 1
-            if verbose:
-                print(f"Restart nach : {ng.no_improvement_counter} Iterationen ohne Verbesserung.")
+                    print(f"Restart nach : {ng.no_improvement_counter} Iterationen ohne Verbesserung.")
             
-            # Wähle eine diverse Lösung aus dem Pool und störe sie stark
-            current = ng.shaking(select_from_pool(), k=3, repair=True) 
-            add_to_pool(current)
-            ng.no_improvement_counter = 0
+                # Wähle eine diverse Lösung aus dem Pool und störe sie stark
+                restart_from = select_from_pool()
+                with phase('shaking'):
+                    current = ng.shaking(restart_from, k=3, repair=True) 
+                add_to_pool(current)
+                ng.no_improvement_counter = 0
+
+            if trace is not None:
+                trace.record(elapsed_offset + deadline.elapsed(), iteration, current, best, len(pool), event)
+
+            # Schritt 5: Periodischer Checkpoint (am Ende einer Iteration, Kosten: ein paar KB pickle)
+            if checkpoint_path is not None and time.monotonic() - last_checkpoint >= checkpoint_interval:
+                with phase('checkpoint'):
+                    write_checkpoint()
+                last_checkpoint = time.monotonic()
             
-    if verbose:
-        print(f"VNS ist abgeschlossen | Bester gefundener Score: {best.score} | Restarts: {restarts}")
+    finally:
+        overrun = deadline.finish()
+        kept = archive.update(input_data, [best] + pool.solutions) if archive is not None else None
+        if run_info is not None:
+            run_info['elapsed'] = elapsed_offset + deadline.elapsed()
+            run_info['overrun'] = overrun
+            if isinstance(deadline, EvaluationBudget):
+                run_info['evaluations'] = evaluations_offset + deadline.evaluations
+            run_info['restarts'] = restarts
+            run_info['iterations'] = iteration
+            run_info['upper_bound'] = upper_bound
+            run_info['gap'] = optimality_gap(best.score, upper_bound)
+            # Warum die Hauptschleife geendet hat / 'stopped': der Aufrufer hat den Generator vorzeitig geschlossen
+            if stagnation_counter >= vns_stagnation_limit:
+                run_info['stop_reason'] = 'stagnation'
+            elif upper_bound is not None and best.score >= upper_bound:
+                run_info['stop_reason'] = 'upper_bound'
+            elif max_iterations is not None and iteration >= max_iterations:
+                run_info['stop_reason'] = 'max_iterations'
+            elif stopper is not None and stopper.should_stop(elapsed_offset + deadline.elapsed()):
+                run_info['stop_reason'] = 'converged'
+            elif deadline.expired():
+                run_info['stop_reason'] = 'evaluations' if isinstance(deadline, EvaluationBudget) else 'time'
+            else:
+                run_info['stop_reason'] = 'stopped'
+            if return_state:
+                run_info['state'] = current_state()
+            if stats is not None:
+                run_info['operator_stats'] = stats.to_rows()
+            if trace is not None:
+                run_info['trace'] = trace
+            if selectors is not None:
+                run_info['operator_weights'] = {name: selector.get_state() for name, selector in selectors.items()}
+            if archive is not None:
+                run_info['warm_start'] = warm_started
+                run_info['elite_archive_size'] = len(kept)
+
+        if trace is not None and trace_path is not None:
+            trace.dump(trace_path)
+        if profiler is not None and owns_profiler:
+            profiler.stop()
+            if run_info is not None:
+                run_info['profile'] = profiler.summary()
+            if verbose:
+                print(profiler.report())
+
+        if verbose:
+            print(f"VNS ist abgeschlossen | Bester gefundener Score: {best.score} | Restarts: {restarts}")
+            if upper_bound is not None:
+                if best.score >= upper_bound:
+                    print(f"   Obere Schranke {upper_bound} erreicht: Lösung ist bewiesen optimal")
+                else:
+                    print(f"   Obere Schranke: {upper_bound} | Optimalitätslücke: {optimality_gap(best.score, upper_bound):.1%}")
+            if isinstance(deadline, EvaluationBudget):
+                print(f"   Bewertungen: {evaluations_offset + deadline.evaluations} von {evaluations_offset + deadline.max_evaluations}")
+            elif overrun > 0:
+                print(f"   Zeitlimit um {overrun:.3f} s überschritten")
+            if registry is not None:
+                print(f"   Bekannte lokale Optima: {len(registry)} | Übersprungene VNDs: {registry.hits} | Übersprungene Nachbarschaften: {registry.skipped_scans}")
+
 
-    return best
 
 
 